@@ -0,0 +1,526 @@
+"""性能基准：生成模拟的 Gaussian 09 日志，测量提取、匹配、表格刷新与导出的耗时
+
+示例:
+    python gaussian_benchmark.py run --counts 10 1000 100000 --sizes 1KB 1MB -o bench.json
+    python gaussian_benchmark.py run --counts 10 --sizes 1GB --baseline bench.json
+    python gaussian_benchmark.py generate logs/ --files 200 --size 5MB
+    python gaussian_benchmark.py startup --repeat 5 -o startup.json
+
+每个阶段在单独的子进程中执行，峰值内存 (peak RSS) 取该子进程及其工作进程的最大值。
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from gaussian_core import (DEFAULT_QUANTITIES, ParseCache, build_rows, collect_file_patterns, extract_files,
+                           match_files)
+from gaussian_export import export_rows
+
+
+BENCHMARK_VERSION = 1
+STAGES = ("extract_serial", "extract", "extract_cached", "auto_match", "update_table", "export_xlsx", "export_csv")
+SIZE_UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+GUI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "v.0.1beta.py")
+
+# 启动时不应导入的第三方库（只在提取或导出时才需要）
+HEAVY_MODULES = ("pandas", "numpy", "xlsxwriter", "pyarrow")
+
+# 在新的解释器中导入界面脚本并显示主窗口，输出各时间点（秒，从解释器开始导入脚本算起）
+STARTUP_SCRIPT = """
+import importlib.util, json, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("gaussian_gui", sys.argv[1])
+gui = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gui)
+result = {"import_seconds": time.perf_counter() - start}
+try:
+    root = gui.tk.Tk()
+except gui.tk.TclError as e:
+    result["window_skipped"] = str(e)
+else:
+    gui.GaussianEnergyAnalyzer(root)
+    root.update()
+    result["first_window_seconds"] = time.perf_counter() - start
+    root.destroy()
+result["loaded_modules"] = [name for name in sys.argv[2:] if name in sys.modules]
+print(json.dumps(result))
+"""
+
+
+def parse_size(text):
+    """把 1KB / 10MB / 1GB 形式的大小转换为字节数"""
+    text = text.strip().upper()
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(text)
+
+
+def format_size(size):
+    for unit in ("GB", "MB", "KB"):
+        if size >= SIZE_UNITS[unit] and size % SIZE_UNITS[unit] == 0:
+            return f"{size // SIZE_UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+# ---------------------------------------------------------------- 模拟日志
+
+HEADER = """ Entering Gaussian System, Link 0=g09
+ Input={name}.gjf
+ Output={name}.log
+ Initial command:
+ /opt/g09/l1.exe "/scratch/Gau-{pid}.inp" -scrdir="/scratch/"
+ Entering Link 1 = /opt/g09/l1.exe PID=     {pid}.
+
+ Copyright (c) 1988,1990,1992,1993,1995,1998,2003,2009,2013,
+            Gaussian, Inc.  All Rights Reserved.
+
+ ******************************************
+ Gaussian 09:  ES64L-G09RevD.01 24-Apr-2013
+                 1-Jan-2024
+ ******************************************
+ %nprocshared=16
+ Will use up to   16 processors via shared memory.
+ %mem=32GB
+ ----------------------------------
+ #p {route}
+ ----------------------------------
+"""
+
+ELEMENTS = ((6, "C"), (1, "H"), (8, "O"), (7, "N"))
+
+
+def fortran(value, digits):
+    """Fortran 风格的指数表示，如 1.23D-03"""
+    return f"{value:.{digits}E}".replace("E", "D")
+
+
+def render_geometry(atoms, shift=0.0):
+    lines = [" " + "-" * 69,
+             "                         Standard orientation:",
+             " " + "-" * 69,
+             " Center     Atomic      Atomic             Coordinates (Angstroms)",
+             " Number     Number       Type             X           Y           Z",
+             " " + "-" * 69]
+    for i in range(atoms):
+        number = ELEMENTS[i % len(ELEMENTS)][0]
+        x, y, z = 0.7 * i + shift, 0.35 * (i % 3) - shift, 0.2 * (i % 5)
+        lines.append(f"{i + 1:7d}{number:11d}{0:12d}{x:16.6f}{y:12.6f}{z:12.6f}")
+    lines.append(" " + "-" * 69)
+    return "\n".join(lines) + "\n"
+
+
+def render_scf(energy, scf_cycles, method="RB3LYP"):
+    """一次SCF迭代过程及 SCF Done 行"""
+    lines = []
+    delta = 0.5
+    for cycle in range(1, scf_cycles + 1):
+        delta /= 7.0
+        lines.append(f" Cycle{cycle:4d}  Pass 1  IDiag  1:")
+        lines.append(f" E= {energy + delta:.12f}     Delta-E={-delta:18.12f} Rises=F Damp=F")
+        lines.append(f" DIIS: error= {fortran(delta, 2)} at cycle{cycle:4d} NSaved={cycle:4d}.")
+    lines.append(f" SCF Done:  E({method}) =  {energy:.12f}     A.U. after {scf_cycles:4d} cycles")
+    return "\n".join(lines) + "\n"
+
+
+def render_opt_step(energy, atoms, scf_cycles, step):
+    """几何优化的一步：构型、SCF迭代与收敛判据"""
+    force = 0.01 / (step + 1)
+    return (render_geometry(atoms, 0.001 * step) + render_scf(energy, scf_cycles) +
+            "         Item               Value     Threshold  Converged?\n"
+            f" Maximum Force            {force:.6f}     0.000450     {'YES' if force < 4.5e-4 else 'NO '}\n"
+            f" RMS     Force            {force / 3:.6f}     0.000300     {'YES' if force < 9e-4 else 'NO '}\n"
+            f" Maximum Displacement     {force * 4:.6f}     0.001800     NO \n"
+            f" RMS     Displacement     {force * 2:.6f}     0.001200     NO \n"
+            f" Predicted change in Energy=-{fortran(force / 100, 6)}\n")
+
+
+def render_orbitals(count=40):
+    """单点计算输出中的轨道能量（用于填充到指定大小）"""
+    lines = []
+    for i in range(count):
+        values = "".join(f"{-10.2 + 0.013 * (i * 5 + j):10.5f}" for j in range(5))
+        lines.append(f" Alpha  occ. eigenvalues --{values}")
+    return "\n".join(lines) + "\n"
+
+
+def render_thermochemistry(energy):
+    zpe, thermal, enthalpy, gibbs = 0.123456, 0.130123, 0.131067, 0.095432
+    return (" Harmonic frequencies (cm**-1), IR intensities (KM/Mole), Raman scattering\n"
+            " Frequencies --    102.3456               215.7890               300.1234\n"
+            " Frequencies --    512.0000              1024.5000              3050.2500\n"
+            " - Thermochemistry -\n"
+            " Temperature   298.150 Kelvin.  Pressure   1.00000 Atm.\n"
+            f" Zero-point correction=                           {zpe:.6f} (Hartree/Particle)\n"
+            f" Thermal correction to Energy=                    {thermal:.6f}\n"
+            f" Thermal correction to Enthalpy=                  {enthalpy:.6f}\n"
+            f" Thermal correction to Gibbs Free Energy=         {gibbs:.6f}\n"
+            f" Sum of electronic and zero-point Energies=        {energy + zpe:.6f}\n"
+            f" Sum of electronic and thermal Energies=           {energy + thermal:.6f}\n"
+            f" Sum of electronic and thermal Enthalpies=         {energy + enthalpy:.6f}\n"
+            f" Sum of electronic and thermal Free Energies=      {energy + gibbs:.6f}\n")
+
+
+def write_synthetic_log(file_path, size=64 << 10, scf_cycles=12, freq=True, atoms=12, index=0):
+    """写出一个约 size 字节（不小于一个完整日志的最小长度）的模拟 Gaussian 09 日志
+
+    freq=True 为几何优化+频率计算（多步优化填充到指定大小，末尾含热化学数据），
+    否则为单点计算（以轨道能量输出填充）。每个文件的最终能量随 index 变化。
+    """
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    energy = -155.0 - 1e-5 * index
+    route = "opt freq b3lyp/6-31g(d)" if freq else "b3lyp/def2tzvp scf=tight"
+    head = HEADER.format(name=name, pid=10000 + index % 50000, route=route)
+    if freq:
+        body = render_opt_step(energy + 0.01, atoms, scf_cycles, 0)
+        final = render_opt_step(energy, atoms, scf_cycles, 50) + render_thermochemistry(energy)
+    else:
+        head += render_geometry(atoms) + render_scf(energy, scf_cycles)
+        body = render_orbitals()
+        final = ""
+    final += " Normal termination of Gaussian 09 at Mon Jan  1 00:00:00 2024.\n"
+
+    head, body, final = head.encode(), body.encode(), final.encode()
+    repeats = max(0, (size - len(head) - len(final)) // len(body))
+    batch = body * max(1, min(repeats, (1 << 20) // len(body)))
+    with open(file_path, 'wb') as f:
+        f.write(head)
+        while repeats > 0:
+            count = min(repeats, len(batch) // len(body))
+            f.write(batch[:count * len(body)])
+            repeats -= count
+        f.write(final)
+
+
+def generate_dataset(directory, files, size, scf_cycles=12):
+    """生成 files 个日志（各一半为单点 sp_molN.log 与频率 molN.log），返回 (SCF文件, Gibbs文件)
+
+    Gibbs文件按相反顺序返回，使自动匹配需要真正查找。
+    """
+    os.makedirs(directory, exist_ok=True)
+    scf_files, gibbs_files = [], []
+    for i in range(max(1, files // 2)):
+        scf_file = os.path.join(directory, f"sp_mol{i}.log")
+        gibbs_file = os.path.join(directory, f"mol{i}.log")
+        write_synthetic_log(scf_file, size, scf_cycles, freq=False, index=i)
+        write_synthetic_log(gibbs_file, size, scf_cycles, freq=True, index=i)
+        scf_files.append(scf_file)
+        gibbs_files.append(gibbs_file)
+    return scf_files, gibbs_files[::-1]
+
+
+# ---------------------------------------------------------------- 测量
+
+def peak_rss_mb():
+    """当前进程及已结束子进程的峰值常驻内存 (MB)，不支持时返回 None"""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux 以KB为单位，macOS 以字节为单位
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def stage_extract(scf_files, gibbs_files, workers, workdir, cached=False):
+    file_patterns = collect_file_patterns(scf_files, gibbs_files)
+    cache = None
+    if cached:
+        cache = ParseCache(os.path.join(workdir, "bench_cache.sqlite3"))
+        cache.clear()
+        extract_files(file_patterns, workers, cache=cache)
+    total_bytes = sum(os.path.getsize(f) for f in file_patterns)
+    start = time.perf_counter()
+    extract_files(file_patterns, workers, cache=cache)
+    return time.perf_counter() - start, len(file_patterns), total_bytes
+
+
+def stage_auto_match(scf_files, gibbs_files, workers, workdir):
+    start = time.perf_counter()
+    match_files(scf_files, gibbs_files)
+    return time.perf_counter() - start, len(scf_files) + len(gibbs_files), None
+
+
+def stage_update_table(scf_files, gibbs_files, workers, workdir):
+    """在真实的Tk窗口中构建数据表并刷新表格（需要图形显示）"""
+    try:
+        import tkinter as tk
+    except ImportError:
+        raise StageSkipped("缺少 tkinter")
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise StageSkipped(f"无法创建Tk窗口: {e}")
+    root.withdraw()
+    spec = importlib.util.spec_from_file_location("gaussian_gui", GUI_SCRIPT)
+    gui = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gui)
+
+    scf_files, gibbs_files, _ = match_files(scf_files, gibbs_files)
+    file_values, _ = extract_files(collect_file_patterns(scf_files, gibbs_files), workers)
+    app = gui.GaussianEnergyAnalyzer(root)
+    app.scf_files, app.gibbs_files = scf_files, gibbs_files
+    start = time.perf_counter()
+    app.set_data(file_values, list(DEFAULT_QUANTITIES))
+    app.page = 0
+    app.update_table()
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    root.destroy()
+    return elapsed, len(scf_files), None
+
+
+def stage_export(scf_files, gibbs_files, workers, workdir, fmt="xlsx"):
+    scf_files, gibbs_files, _ = match_files(scf_files, gibbs_files)
+    file_values, _ = extract_files(collect_file_patterns(scf_files, gibbs_files), workers)
+    rows = build_rows(scf_files, gibbs_files, file_values)
+    output_file = os.path.join(workdir, f"bench_export.{fmt}")
+    start = time.perf_counter()
+    try:
+        export_rows(rows, output_file, fmt)
+    except ImportError as e:
+        raise StageSkipped(f"缺少 {e.name}")
+    elapsed = time.perf_counter() - start
+    return elapsed, len(rows), os.path.getsize(output_file)
+
+
+class StageSkipped(Exception):
+    """当前环境无法执行该阶段"""
+
+
+STAGE_FUNCTIONS = {
+    "extract_serial": lambda s, g, w, d: stage_extract(s, g, 1, d),
+    "extract": stage_extract,
+    "extract_cached": lambda s, g, w, d: stage_extract(s, g, w, d, cached=True),
+    "auto_match": stage_auto_match,
+    "update_table": stage_update_table,
+    "export_xlsx": lambda s, g, w, d: stage_export(s, g, w, d, "xlsx"),
+    "export_csv": lambda s, g, w, d: stage_export(s, g, w, d, "csv"),
+}
+
+
+def run_stage(stage, scf_files, gibbs_files, workers, workdir):
+    """子进程中执行一个阶段，返回该阶段的测量结果"""
+    try:
+        seconds, items, total_bytes = STAGE_FUNCTIONS[stage](scf_files, gibbs_files, workers, workdir)
+    except StageSkipped as e:
+        return {"skipped": str(e)}
+    result = {"seconds": round(seconds, 6), "items": items,
+              "items_per_s": round(items / seconds, 1) if seconds > 0 else None}
+    if total_bytes is not None:
+        result["bytes"] = total_bytes
+        result["mb_per_s"] = round(total_bytes / seconds / 1e6, 1) if seconds > 0 else None
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def run_isolated(stage, scf_files, gibbs_files, workers, workdir):
+    """在新的子进程中执行阶段，使峰值内存互不影响"""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run_stage, stage, scf_files, gibbs_files, workers, workdir).result()
+
+
+def run_benchmarks(counts, sizes, stages=STAGES, scf_cycles=12, workers=None, workdir=None,
+                   max_total=4 << 30, keep=False, log=print):
+    """按 (文件数, 文件大小) 组合生成数据并测量各阶段，返回可写为JSON的结果"""
+    workers = workers or os.cpu_count() or 1
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="gaussian_bench_")
+    report = {
+        "benchmark_version": BENCHMARK_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "workers": workers,
+        "scf_cycles": scf_cycles,
+        "cases": [],
+    }
+    try:
+        for size in sizes:
+            for count in counts:
+                case = {"files": count, "file_size": size, "stages": {}}
+                report["cases"].append(case)
+                if count * size > max_total:
+                    case["skipped"] = f"数据总量超过 --max-total ({format_size(max_total)})"
+                    log(f"跳过 {count} x {format_size(size)}: {case['skipped']}")
+                    continue
+
+                directory = os.path.join(workdir, f"{count}x{format_size(size)}")
+                start = time.perf_counter()
+                scf_files, gibbs_files = generate_dataset(directory, count, size, scf_cycles)
+                case["generate_seconds"] = round(time.perf_counter() - start, 3)
+                for stage in stages:
+                    result = run_isolated(stage, scf_files, gibbs_files, workers, workdir)
+                    case["stages"][stage] = result
+                    log(f"{count:>7} x {format_size(size):>6}  {stage:<15}" +
+                        (f"跳过: {result['skipped']}" if "skipped" in result else
+                         f"{result['seconds']:9.3f} 秒  {result['items_per_s'] or 0:>12,.0f} 项/秒"
+                         f"  峰值内存 {result['peak_rss_mb']} MB"))
+                if not keep:
+                    shutil.rmtree(directory, ignore_errors=True)
+    finally:
+        if own_workdir and not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+def compare_reports(report, baseline, tolerance=0.2):
+    """与基准结果比较，返回耗时增加超过 tolerance 的 [(文件数, 大小, 阶段, 倍数)]"""
+    previous = {(case["files"], case["file_size"], stage): result.get("seconds")
+                for case in baseline.get("cases", []) for stage, result in case.get("stages", {}).items()}
+    regressions = []
+    for case in report["cases"]:
+        for stage, result in case["stages"].items():
+            old = previous.get((case["files"], case["file_size"], stage))
+            new = result.get("seconds")
+            if old and new and new > old * (1 + tolerance):
+                regressions.append((case["files"], case["file_size"], stage, new / old))
+    return regressions
+
+
+def measure_startup(repeat=5):
+    """在新的解释器中多次启动界面，返回各项耗时的中位数（秒）与启动时已导入的第三方库
+
+    process_seconds 为整个解释器进程（含 Python 自身启动）的时间；没有图形显示时
+    只测量导入，first_window_seconds 为 None。
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, GUI_SCRIPT] + list(HEAVY_MODULES),
+                                cwd=os.path.dirname(GUI_SCRIPT), capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result["process_seconds"] = time.perf_counter() - start
+        runs.append(result)
+
+    def median(key):
+        values = [run[key] for run in runs if key in run]
+        return round(statistics.median(values), 4) if values else None
+
+    report = {
+        "benchmark_version": BENCHMARK_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "import_seconds": median("import_seconds"),
+        "first_window_seconds": median("first_window_seconds"),
+        "process_seconds": median("process_seconds"),
+        "loaded_modules": runs[-1]["loaded_modules"],
+    }
+    if "window_skipped" in runs[-1]:
+        report["window_skipped"] = runs[-1]["window_skipped"]
+    return report
+
+
+# ---------------------------------------------------------------- 命令行
+
+def cmd_run(args):
+    report = run_benchmarks(args.counts, [parse_size(s) for s in args.sizes], args.stages, args.scf_cycles,
+                            args.workers, args.workdir, parse_size(args.max_total), args.keep,
+                            log=lambda text: print(text, file=sys.stderr))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_reports(report, json.load(f), args.tolerance)
+        for count, size, stage, ratio in regressions:
+            print(f"性能退化: {count} x {format_size(size)} {stage} 耗时为基准的 {ratio:.2f} 倍", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+def cmd_generate(args):
+    scf_files, gibbs_files = generate_dataset(args.directory, args.files, parse_size(args.size), args.scf_cycles)
+    print(f"已生成 {len(scf_files) + len(gibbs_files)} 个日志到 {args.directory}", file=sys.stderr)
+    return 0
+
+
+def cmd_startup(args):
+    report = measure_startup(args.repeat)
+    window = report["first_window_seconds"]
+    print(f"导入界面 {report['import_seconds']:.3f} 秒，首个窗口 " +
+          (f"{window:.3f} 秒" if window is not None else f"跳过（{report['window_skipped']}）") +
+          f"，进程总计 {report['process_seconds']:.3f} 秒；启动时已导入: {', '.join(report['loaded_modules']) or '无'}",
+          file=sys.stderr)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        key = "first_window_seconds" if window is not None and baseline.get("first_window_seconds") else \
+            "import_seconds"
+        old, new = baseline.get(key), report[key]
+        if old and new and new > old * (1 + args.tolerance):
+            print(f"性能退化: 启动 {key} 为基准的 {new / old:.2f} 倍", file=sys.stderr)
+            return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Gaussian 能量分析性能基准")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="生成模拟日志并测量各阶段耗时")
+    run.add_argument("--counts", nargs="+", type=int, default=[10, 100, 1000], help="文件数")
+    run.add_argument("--sizes", nargs="+", default=["1KB", "100KB", "10MB"], help="单个文件大小，如 1KB 1MB 1GB")
+    run.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES), help="需要测量的阶段")
+    run.add_argument("--scf-cycles", type=int, default=12, help="每次SCF的迭代次数")
+    run.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="提取时的并行进程数")
+    run.add_argument("--workdir", help="存放模拟日志的目录（默认临时目录）")
+    run.add_argument("--keep", action="store_true", help="保留生成的日志")
+    run.add_argument("--max-total", default="4GB", help="跳过数据总量超过该值的组合")
+    run.add_argument("-o", "--output", help="JSON结果文件（默认输出到标准输出）")
+    run.add_argument("--baseline", help="与之前的JSON结果比较，有退化时返回 1")
+    run.add_argument("--tolerance", type=float, default=0.2, help="允许的耗时增加比例")
+    run.set_defaults(func=cmd_run)
+
+    generate = subparsers.add_parser("generate", help="只生成模拟日志")
+    generate.add_argument("directory", help="输出目录")
+    generate.add_argument("--files", type=int, default=100, help="文件数（单点与频率各一半）")
+    generate.add_argument("--size", default="64KB", help="单个文件大小")
+    generate.add_argument("--scf-cycles", type=int, default=12, help="每次SCF的迭代次数")
+    generate.set_defaults(func=cmd_generate)
+
+    startup = subparsers.add_parser("startup", help="测量界面启动时间（导入与首个窗口显示）")
+    startup.add_argument("--repeat", type=int, default=5, help="启动次数（取中位数）")
+    startup.add_argument("-o", "--output", help="JSON结果文件（默认输出到标准输出）")
+    startup.add_argument("--baseline", help="与之前的JSON结果比较，有退化时返回 1")
+    startup.add_argument("--tolerance", type=float, default=0.2, help="允许的耗时增加比例")
+    startup.set_defaults(func=cmd_startup)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
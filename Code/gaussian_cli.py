@@ -0,0 +1,504 @@
+"""Gaussian 能量分析命令行工具（无需图形界面）
+
+示例:
+    python gaussian_cli.py extract --scf "sp/*.log" --gibbs freq/ -o energies.csv
+    python gaussian_cli.py extract --discover project/ --filter "*_conf*" -o energies.csv
+    python gaussian_cli.py shard plan --discover project/ -n 4 -o campaign.manifest.json
+    python gaussian_cli.py shard run campaign.manifest.json --shard 0
+    python gaussian_cli.py shard merge campaign.manifest.json -o energies.xlsx
+    python gaussian_cli.py trajectory opt/ -o trajectories.npz
+    python gaussian_cli.py clear-cache
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+from gaussian_core import (DEFAULT_CACHE_PATH, DEFAULT_QUANTITIES, DEFAULT_TEMPERATURE, DIAGNOSTIC_LABELS, EXTRACTORS,
+                           STREAM_BATCH_PAIRS, ParseCache, build_index, build_match_rules, build_rows,
+                           collect_file_patterns, compression_of, diagnose_files, diagnostics_summary, extract_files,
+                           is_log_file, load_index, match_files, result_columns, save_index, stream_rows,
+                           write_diagnostics)
+from gaussian_discovery import discover_logs, discovery_summary
+from gaussian_export import EXPORT_FORMATS, export_format, export_rows, open_sink
+from gaussian_profiling import PROFILER
+from gaussian_shard import (load_manifest, load_partials, merge_partials, partial_path, plan_shards, run_shard,
+                            shard_rows, write_manifest, write_partial)
+from gaussian_store import DEFAULT_PROJECT_PATH, ResultStore, describe_run
+
+
+def expand_inputs(inputs):
+    """展开输入：文件按原样保留，目录取其中的 *.log 与压缩日志，其余按通配符展开"""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            files.extend(sorted(os.path.join(item, name) for name in os.listdir(item)
+                                if is_log_file(name)))
+        elif os.path.isfile(item):
+            files.append(item)
+        else:
+            files.extend(sorted(glob.glob(item, recursive=True)))
+    return [os.path.abspath(f) for f in files]
+
+
+def open_cache(args):
+    """按命令行参数打开解析缓存，不可用时返回 None"""
+    if args.no_cache:
+        return None
+    try:
+        return ParseCache(args.cache)
+    except Exception as e:
+        print(f"警告: 无法打开缓存 {args.cache}: {e}", file=sys.stderr)
+        return None
+
+
+def print_match_report(report):
+    """输出自动匹配中未匹配、有歧义和重复的文件"""
+    if report["unmatched"]:
+        print(f"{len(report['unmatched'])} 个SCF文件未找到对应Gibbs文件", file=sys.stderr)
+    for name, candidates in report["ambiguous"].items():
+        print(f"有歧义的匹配: {name} -> {', '.join(candidates)}（使用第一个）", file=sys.stderr)
+    for name, names in report["duplicates"].items():
+        print(f"重复使用的Gibbs文件: {name} <- {', '.join(names)}", file=sys.stderr)
+
+
+def gather_files(args):
+    """按 --scf/--gibbs/--discover 收集文件并按匹配规则配对，返回 (scf_files, gibbs_files)；出错时返回 None"""
+    scf_files = expand_inputs(args.scf or [])
+    gibbs_files = expand_inputs(args.gibbs or [])
+    if args.discover:
+        try:
+            found = discover_logs(args.discover, args.filter, args.regex, not args.keep_incomplete, args.workers)
+        except re.error as e:
+            print(f"错误: 正则表达式无效: {e}", file=sys.stderr)
+            return None
+        if not args.quiet:
+            print(f"目录导入: {discovery_summary(found) or '没有找到日志文件'}", file=sys.stderr)
+        scf_files += found["scf"]
+        gibbs_files += found["gibbs"]
+    if not scf_files:
+        print("错误: 未找到SCF文件", file=sys.stderr)
+        return None
+
+    if not args.no_match:
+        rules = build_match_rules(args.scf_prefix, args.scf_suffix, args.gibbs_prefix, args.gibbs_suffix,
+                                  args.scf_regex, args.gibbs_regex, *(args.parallel_dirs or (None, None)))
+        scf_files, gibbs_files, report = match_files(scf_files, gibbs_files, rules)
+        if not args.quiet:
+            print_match_report(report)
+    return scf_files, gibbs_files
+
+
+def export_results(args, fmt, scf_files, gibbs_files, file_values, quantities):
+    """组装结果行（按需追加 Boltzmann 分析列）并导出，返回行数；出错时返回 None"""
+    rows = build_rows(scf_files, gibbs_files, file_values, quantities)
+    if args.boltzmann:
+        # 需要 NumPy，仅在使用时导入
+        from gaussian_analysis import add_boltzmann_columns
+        try:
+            add_boltzmann_columns(rows, args.group, args.temperature)
+        except (ValueError, re.error) as e:
+            print(f"\n错误: {e}", file=sys.stderr)
+            return None
+    try:
+        export_rows(rows, args.output, fmt)
+    except ImportError as e:
+        print(f"\n错误: 导出 {fmt} 需要安装 {e.name}", file=sys.stderr)
+        return None
+    return len(rows)
+
+
+def save_to_project(args, scf_files, gibbs_files, file_values, quantities):
+    """按 --project 把结果追加到项目结果库"""
+    if not args.project:
+        return
+    run_id = ResultStore(args.project).append_run(scf_files, gibbs_files, file_values, quantities)
+    if not args.quiet:
+        print(f"已保存到结果库 {args.project}（记录 #{run_id}）", file=sys.stderr)
+
+
+def stream_extract(args, fmt, scf_files, gibbs_files):
+    """逐批提取并直接写出，内存中不保留完整的结果表"""
+    def progress(done, total):
+        if not args.quiet:
+            print(f"\r正在提取并写出... {done}/{total} 个文件对", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    errors, diagnostics = {}, {}
+    with PROFILER.profiled():
+        try:
+            with open_sink(args.output, result_columns(args.quantities), fmt) as sink:
+                for rows in stream_rows(scf_files, gibbs_files, args.quantities, args.link1, args.workers,
+                                        args.chunk_size, open_cache(args), args.batch_size, progress,
+                                        errors=errors, diagnostics=diagnostics):
+                    sink.write(rows)
+        except ImportError as e:
+            print(f"\n错误: 导出 {fmt} 需要安装 {e.name}", file=sys.stderr)
+            return 2
+
+    if not args.quiet:
+        print(f"\n已导出 {sink.row_count} 行到 {args.output}（{time.perf_counter() - start:.2f} 秒）", file=sys.stderr)
+    write_profile(args)
+    report_diagnostics(args, diagnostics)
+    return 1 if errors else 0
+
+
+def cmd_extract(args):
+    try:
+        fmt = export_format(args.output, args.format)
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    if args.stream and (args.boltzmann or args.project):
+        print("错误: --stream 不能与 --boltzmann、--project 同时使用（二者需要完整的结果表）", file=sys.stderr)
+        return 2
+
+    if args.profile or args.trace or args.cprofile:
+        PROFILER.enable(cprofile=bool(args.cprofile))
+
+    files = gather_files(args)
+    if files is None:
+        return 2
+    scf_files, gibbs_files = files
+    if args.stream:
+        return stream_extract(args, fmt, scf_files, gibbs_files)
+
+    def progress(done, total, bytes_read):
+        if not args.quiet:
+            print(f"\r正在提取... {done}/{total} 个文件", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    with PROFILER.profiled():
+        file_patterns = collect_file_patterns(scf_files, gibbs_files, args.quantities, args.link1)
+        file_values, errors = extract_files(file_patterns, args.workers, args.chunk_size, open_cache(args), progress)
+        count = export_results(args, fmt, scf_files, gibbs_files, file_values, args.quantities)
+        if count is None:
+            return 2
+
+    if not args.quiet:
+        print(f"\n已导出 {count} 行到 {args.output}（{time.perf_counter() - start:.2f} 秒）", file=sys.stderr)
+    save_to_project(args, scf_files, gibbs_files, file_values, args.quantities)
+    write_profile(args)
+    report_diagnostics(args, diagnose_files(file_patterns, file_values, errors))
+    return 1 if errors else 0
+
+
+def cmd_shard_plan(args):
+    """匹配文件并写出分片清单"""
+    files = gather_files(args)
+    if files is None:
+        return 2
+    try:
+        manifest = plan_shards(*files, args.shards, args.quantities, args.link1)
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    write_manifest(manifest, args.output)
+    if not args.quiet:
+        print(f"已写出分片清单 {args.output}：{len(manifest['pairs'])} 对文件，{args.shards} 片", file=sys.stderr)
+    return 0
+
+
+def cmd_shard_run(args):
+    """在本节点提取清单中的一片或几片，各片结果写到清单旁（或 -o 指定的文件）"""
+    try:
+        manifest = load_manifest(args.manifest)
+        for shard in args.shard:
+            shard_rows(manifest, shard)
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    if args.output and len(args.shard) > 1:
+        print("错误: 同时运行多片时不能指定 -o", file=sys.stderr)
+        return 2
+
+    status = 0
+    cache = open_cache(args)
+    for shard in args.shard:
+        def progress(done, total, bytes_read):
+            if not args.quiet:
+                print(f"\r分片 {shard}: 正在提取... {done}/{total} 个文件", end="", file=sys.stderr, flush=True)
+
+        start = time.perf_counter()
+        partial = run_shard(manifest, shard, args.workers, args.chunk_size, cache, progress)
+        output_file = args.output or partial_path(args.manifest, shard, manifest["shards"])
+        write_partial(partial, output_file)
+        if not args.quiet:
+            print(f"\n分片 {shard}: {len(partial['rows'])} 对文件，已写出 {output_file}"
+                  f"（{time.perf_counter() - start:.2f} 秒）", file=sys.stderr)
+        if partial["errors"]:
+            status = 1
+    return status
+
+
+def cmd_shard_merge(args):
+    """合并各片结果，按清单中的顺序重建结果表并导出"""
+    try:
+        fmt = export_format(args.output, args.format)
+        manifest = load_manifest(args.manifest)
+        partials = load_partials(args.manifest, manifest, args.partials)
+        scf_files, gibbs_files, file_values, errors = merge_partials(manifest, partials)
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+
+    quantities = manifest["quantities"]
+    count = export_results(args, fmt, scf_files, gibbs_files, file_values, quantities)
+    if count is None:
+        return 2
+    if not args.quiet:
+        print(f"已合并 {len(partials)} 片，导出 {count} 行到 {args.output}", file=sys.stderr)
+    save_to_project(args, scf_files, gibbs_files, file_values, quantities)
+    file_patterns = collect_file_patterns(scf_files, gibbs_files, quantities, manifest["link1"])
+    report_diagnostics(args, diagnose_files(file_patterns, file_values, errors))
+    return 1 if errors else 0
+
+
+def report_diagnostics(args, diagnostics):
+    """输出诊断结果：写入 --diagnostics 文件，或逐个打印到标准错误"""
+    if args.diagnostics:
+        write_diagnostics(diagnostics, args.diagnostics)
+    if not diagnostics:
+        return
+    print(f"有问题的文件: {diagnostics_summary(diagnostics)}", file=sys.stderr)
+    if args.diagnostics:
+        print(f"诊断日志已写入 {args.diagnostics}", file=sys.stderr)
+        return
+    for file_path, (category, detail) in diagnostics.items():
+        print(f"{DIAGNOSTIC_LABELS[category]}: {file_path}（{detail}）", file=sys.stderr)
+
+
+def write_profile(args):
+    """按命令行参数输出性能统计"""
+    if not PROFILER.enabled:
+        return
+    if args.profile == "-":
+        print("\n".join(PROFILER.report_lines()), file=sys.stderr)
+    elif args.profile:
+        PROFILER.dump_json(args.profile)
+    if args.trace:
+        PROFILER.dump_chrome_trace(args.trace)
+    if args.cprofile:
+        PROFILER.dump_cprofile(args.cprofile)
+
+
+def cmd_quantities(args):
+    for name, extractor in EXTRACTORS.items():
+        source = "Gibbs" if extractor.source == "gibbs" else "SCF"
+        print(f"{name:<20}{source:<8}{extractor.label} - {extractor.description}")
+    return 0
+
+
+def cmd_project(args):
+    store = ResultStore(args.db)
+    if args.export:
+        try:
+            count = store.export_run(args.export, args.run, provenance=not args.no_provenance)
+        except ValueError as e:
+            print(f"错误: {e}", file=sys.stderr)
+            return 2
+        except ImportError as e:
+            print(f"错误: 导出需要安装 {e.name}", file=sys.stderr)
+            return 2
+        print(f"已导出 {count} 行到 {args.export}", file=sys.stderr)
+        return 0
+    for run in store.runs():
+        print(describe_run(run))
+    return 0
+
+
+def cmd_index(args):
+    """建立（或读取已有的）Link1 分步索引并列出各步骤"""
+    status = 0
+    for file_path in expand_inputs(args.inputs):
+        if compression_of(file_path):
+            print(f"跳过压缩文件: {file_path}", file=sys.stderr)
+            continue
+        try:
+            index = None if args.rebuild else load_index(file_path)
+            if index is None:
+                index = build_index(file_path)
+                save_index(file_path, index)
+        except OSError as e:
+            print(f"文件读取错误: {file_path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        print(file_path)
+        for number, step in enumerate(index["steps"], start=1):
+            sections = "  ".join(f"{name}@{start}" for name, (start, _) in step["sections"].items())
+            print(f"  步骤{number}  {step['job']:<10}{step['route']}")
+            print(f"         字节 {step['start']}-{step['end']}  {sections}")
+    return status
+
+
+def cmd_trajectory(args):
+    """提取优化轨迹并保存为 .npz 或 .npy 目录，列出最后一步最大力仍超过阈值的文件"""
+    # 需要 NumPy，仅在使用时导入
+    from gaussian_trajectory import extract_trajectories, final_values, save_trajectories, step_counts
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("错误: 未找到日志文件", file=sys.stderr)
+        return 2
+
+    def progress(done, total):
+        if not args.quiet:
+            print(f"\r正在提取轨迹... {done}/{total} 个文件", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    data = extract_trajectories(files, None if args.step == "all" else args.step, args.workers, progress)
+    save_trajectories(data, args.output)
+    steps = step_counts(data)
+    forces = final_values(data, "max_force")
+    if not args.quiet:
+        print(f"\n已保存 {len(files)} 个文件、{int(steps.sum())} 步到 {args.output}"
+              f"（{time.perf_counter() - start:.2f} 秒）", file=sys.stderr)
+    for file_path, count, force in zip(data["files"], steps, forces):
+        if force > args.force_threshold:
+            print(f"{file_path}\t{count} 步\t最大力 {force:.6f}")
+    for file_path, error in zip(data["files"], data["errors"]):
+        if error:
+            print(f"文件读取错误: {file_path}: {error}", file=sys.stderr)
+    return 1 if any(data["errors"]) else 0
+
+
+def cmd_clear_cache(args):
+    ParseCache(args.cache).clear()
+    print(f"已清空缓存: {args.cache}", file=sys.stderr)
+    return 0
+
+
+def add_input_arguments(parser):
+    """输入文件与自动匹配规则（extract 与 shard plan 共用）"""
+    parser.add_argument("--scf", nargs="+", help="SCF文件、目录或通配符")
+    parser.add_argument("--gibbs", nargs="+", help="Gibbs校正文件、目录或通配符")
+    parser.add_argument("--discover", nargs="+", metavar="DIR",
+                        help="递归查找目录中的日志，按路由部分分为单点（SCF）与频率（Gibbs）文件")
+    parser.add_argument("--filter", metavar="PATTERN", help="--discover 的文件名通配符（或配合 --regex 的正则）")
+    parser.add_argument("--regex", action="store_true", help="--filter 为在完整路径中搜索的正则表达式")
+    parser.add_argument("--keep-incomplete", action="store_true", help="--discover 时不跳过未正常结束的文件")
+    parser.add_argument("--no-match", action="store_true", help="不按文件名自动匹配，按输入顺序配对")
+    parser.add_argument("--scf-prefix", nargs="*", default=["sp_"], help="匹配时去除的SCF文件名前缀")
+    parser.add_argument("--scf-suffix", nargs="*", default=[], help="匹配时去除的SCF文件名后缀")
+    parser.add_argument("--gibbs-prefix", nargs="*", default=[], help="匹配时去除的Gibbs文件名前缀")
+    parser.add_argument("--gibbs-suffix", nargs="*", default=[], help="匹配时去除的Gibbs文件名后缀，如 _freq _opt")
+    parser.add_argument("--scf-regex", help="SCF文件名正则，捕获组作为匹配键")
+    parser.add_argument("--gibbs-regex", help="Gibbs文件名正则（默认同 --scf-regex）")
+    parser.add_argument("--parallel-dirs", nargs=2, metavar=("SCF_ROOT", "GIBBS_ROOT"),
+                        help="平行目录布局：相对两个根目录的子目录须相同")
+
+
+def add_output_arguments(parser):
+    """导出、Boltzmann分析、结果库与诊断（extract 与 shard merge 共用）"""
+    parser.add_argument("-o", "--output", required=True, help="输出文件")
+    parser.add_argument("-f", "--format", choices=EXPORT_FORMATS, help="输出格式（默认按扩展名判断）")
+    parser.add_argument("--boltzmann", action="store_true",
+                        help="追加相对能量(kcal/mol)、Boltzmann权重与组内加权平均列")
+    parser.add_argument("--group", metavar="REGEX", help="Boltzmann分析的分组正则（捕获组为组名，默认全部为一组）")
+    parser.add_argument("--temperature", type=float, default=DEFAULT_TEMPERATURE, help="Boltzmann分析的温度(K)")
+    parser.add_argument("--project", nargs="?", const=DEFAULT_PROJECT_PATH, metavar="DB",
+                        help="把结果追加到项目结果库（默认使用图形界面的结果库）")
+    parser.add_argument("--diagnostics", metavar="LOG",
+                        help="把有问题的文件（读取错误、截断、Error termination、缺少数据段）写入诊断日志")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出进度")
+
+
+def add_cache_arguments(parser):
+    parser.add_argument("--no-cache", action="store_true", help="不使用解析缓存")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="缓存文件路径")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="从Gaussian日志文件中提取能量数据")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract = subparsers.add_parser("extract", help="提取SCF能量与Gibbs校正并导出")
+    add_input_arguments(extract)
+    add_output_arguments(extract)
+    extract.add_argument("-Q", "--quantities", nargs="+", choices=list(EXTRACTORS), default=list(DEFAULT_QUANTITIES),
+                         metavar="NAME", help="需要提取的物理量（见 quantities 子命令）")
+    extract.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    extract.add_argument("--chunk-size", type=int, default=64, help="每个任务包含的文件数")
+    extract.add_argument("--link1", action="store_true",
+                         help="按 Link1 步骤提取：Gibbs 类的量取自最后的频率步骤，其余取自最后一步（使用分步索引）")
+    extract.add_argument("--stream", action="store_true",
+                         help="逐批提取并直接写出（Excel 使用 constant_memory 模式），提取结果只按批保留在内存中")
+    extract.add_argument("--batch-size", type=int, default=STREAM_BATCH_PAIRS, help="--stream 每批的文件对数")
+    add_cache_arguments(extract)
+    extract.add_argument("--profile", metavar="JSON", help="输出各阶段耗时与计数器（- 表示打印到标准错误）")
+    extract.add_argument("--trace", metavar="JSON", help="输出 Chrome trace 文件")
+    extract.add_argument("--cprofile", metavar="PROF", help="输出 cProfile 统计文件")
+    extract.set_defaults(func=cmd_extract)
+
+    quantities = subparsers.add_parser("quantities", help="列出可提取的物理量")
+    quantities.set_defaults(func=cmd_quantities)
+
+    project = subparsers.add_parser("project", help="列出或导出项目结果库中的提取记录")
+    project.add_argument("--db", default=DEFAULT_PROJECT_PATH, help="结果库文件路径")
+    project.add_argument("--export", metavar="FILE", help="导出一条记录（格式按扩展名，推荐 .parquet）")
+    project.add_argument("--run", type=int, help="记录编号（默认最新）")
+    project.add_argument("--no-provenance", action="store_true", help="导出时不附带文件来源列")
+    project.set_defaults(func=cmd_project)
+
+    index = subparsers.add_parser("index", help="为日志建立 Link1 分步索引（保存在日志旁的隐藏 .gidx 文件）并列出各步骤")
+    index.add_argument("inputs", nargs="+", help="日志文件、目录或通配符")
+    index.add_argument("--rebuild", action="store_true", help="忽略已有索引重新建立")
+    index.set_defaults(func=cmd_index)
+
+    shard = subparsers.add_parser("shard", help="分片提取：生成清单、在各节点提取一片、合并结果")
+    shard_commands = shard.add_subparsers(dest="shard_command", required=True)
+
+    plan = shard_commands.add_parser("plan", help="匹配文件并把文件对分成 N 片，写出清单")
+    add_input_arguments(plan)
+    plan.add_argument("-n", "--shards", type=int, required=True, help="分片数（通常为节点数）")
+    plan.add_argument("-Q", "--quantities", nargs="+", choices=list(EXTRACTORS), default=list(DEFAULT_QUANTITIES),
+                      metavar="NAME", help="需要提取的物理量（见 quantities 子命令）")
+    plan.add_argument("--link1", action="store_true", help="按 Link1 步骤提取（见 extract --link1）")
+    plan.add_argument("-o", "--output", required=True, help="清单文件，如 campaign.manifest.json")
+    plan.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="--discover 的并行线程数")
+    plan.add_argument("-q", "--quiet", action="store_true", help="不输出进度")
+    plan.set_defaults(func=cmd_shard_plan)
+
+    run = shard_commands.add_parser("run", help="提取清单中的一片（无需图形界面，可在各节点上运行）")
+    run.add_argument("manifest", help="清单文件")
+    run.add_argument("--shard", type=int, nargs="+", required=True, help="分片编号（从0开始），可指定多个依次提取")
+    run.add_argument("-o", "--output", help="结果文件（默认写到清单旁）")
+    run.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    run.add_argument("--chunk-size", type=int, default=64, help="每个任务包含的文件数")
+    add_cache_arguments(run)
+    run.add_argument("-q", "--quiet", action="store_true", help="不输出进度")
+    run.set_defaults(func=cmd_shard_run)
+
+    merge = shard_commands.add_parser("merge", help="合并各片结果，按清单顺序导出（与单机提取结果相同）")
+    merge.add_argument("manifest", help="清单文件")
+    merge.add_argument("partials", nargs="*", help="各片结果文件（默认读取清单旁的结果）")
+    add_output_arguments(merge)
+    merge.set_defaults(func=cmd_shard_merge)
+
+    trajectory = subparsers.add_parser("trajectory", help="提取优化轨迹（每步SCF能量、力与位移收敛值、坐标）为NumPy数组")
+    trajectory.add_argument("inputs", nargs="+", help="日志文件、目录或通配符")
+    trajectory.add_argument("-o", "--output", required=True,
+                            help="输出 .npz 文件，或目录（每个数组一个 .npy，可内存映射载入）")
+    trajectory.add_argument("--step", default="opt",
+                            help="Link1 多步作业中提取的步骤（作业关键词，默认 opt；all 表示全文）")
+    trajectory.add_argument("--force-threshold", type=float, default=4.5e-4,
+                            help="列出最后一步最大力超过该值的文件（a.u.，默认为 Gaussian 的收敛标准）")
+    trajectory.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    trajectory.add_argument("-q", "--quiet", action="store_true", help="不输出进度")
+    trajectory.set_defaults(func=cmd_trajectory)
+
+    clear_cache = subparsers.add_parser("clear-cache", help="清空解析缓存")
+    clear_cache.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="缓存文件路径")
+    clear_cache.set_defaults(func=cmd_clear_cache)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
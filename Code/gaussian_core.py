@@ -0,0 +1,1370 @@
+"""Gaussian 日志解析核心
+
+不依赖 tkinter 与 pandas，供图形界面 (v.0.1beta.py) 与命令行 (gaussian_cli.py) 共用。
+"""
+import re
+import os
+import bz2
+import copy
+import filecmp
+import gzip
+import hashlib
+import json
+import lzma
+import mmap
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+
+from gaussian_profiling import PROFILER
+
+
+SCF_PATTERN = r"SCF Done:\s+E\(.*\)\s+=\s+([-\d.]+)\s+A.U."
+GIBBS_PATTERN = r"Thermal correction to Gibbs Free Energy=\s+([-\d.]+)"
+# Gaussian 以Fortran格式输出后HF能量，如 -0.23012345678901D+03
+FORTRAN_NUMBER = r"(-?[\d.]+D[-+]\d+)"
+
+
+def parse_number(text):
+    """把捕获的bytes转换为浮点数（兼容Fortran的D指数）"""
+    return float(text.replace(b"D", b"E"))
+
+
+def parse_termination(text):
+    """Normal termination 为 1，Error termination 为 0"""
+    return 1.0 if text == b"Normal" else 0.0
+
+
+def count_negative(text):
+    """统计一行频率中的负值（虚频）个数"""
+    return float(sum(1 for value in text.split() if value.startswith(b"-")))
+
+
+class Extractor:
+    """可提取的物理量
+
+    trigger 为行内触发文本，用于廉价的字节子串预筛选，只有包含触发文本的行才执行正则匹配；
+    regex 的第一个捕获组交给 parse 转换为数值。mode 决定多次出现时的取值：
+        last  - 最后一次出现（倒序扫描，通常只读文件尾部）
+        first - 首次出现
+        sum   - 所有出现求和（需要扫描全文）
+    source 表示从哪类文件提取："scf"（单点能文件）或 "gibbs"（频率文件）。
+    parse 须为模块级函数，以便随任务传给子进程。
+    step 限定 Link1 多步作业中的扫描范围（见 select_step）：None 为全文，"last" 为最后一步，
+    作业关键词（如 "freq"）为最后一个含该关键词的步骤。
+    """
+
+    MODES = ("last", "first", "sum")
+
+    def __init__(self, name, label, trigger, regex, mode="last", source="scf", parse=parse_number,
+                 fmt="{:.8f}", description="", step=None):
+        if mode not in self.MODES:
+            raise ValueError(f"未知的取值方式: {mode}")
+        self.name = name
+        self.label = label
+        self.trigger = trigger
+        self.regex = regex
+        self.mode = mode
+        self.source = source
+        self.parse = parse
+        self.fmt = fmt
+        self.description = description
+        self.step = step
+
+    def signature(self):
+        """用于缓存校验的定义签名"""
+        signature = [self.name, self.trigger, self.regex, self.mode, self.parse.__name__]
+        return signature + [self.step] if self.step else signature
+
+    def scoped(self, step):
+        """限定在 Link1 步骤 step 中提取的副本"""
+        extractor = copy.copy(self)
+        extractor.step = step
+        return extractor
+
+    def display(self, value):
+        """表格中的显示文本"""
+        return "" if value is None else self.fmt.format(value)
+
+
+# 已注册的物理量: 名称 -> Extractor
+EXTRACTORS = {}
+
+
+def register_extractor(extractor):
+    """注册物理量，之后可在界面/命令行中选择"""
+    EXTRACTORS[extractor.name] = extractor
+    return extractor
+
+
+register_extractor(Extractor(
+    "scf", "SCF能量(a.u.)", "SCF Done:", SCF_PATTERN,
+    description="从最后一个SCF Done行提取的电子能量"))
+register_extractor(Extractor(
+    "gibbs", "Gibbs校正(a.u.)", "Thermal correction to Gibbs Free Energy", GIBBS_PATTERN, source="gibbs",
+    description="热校正吉布斯自由能"))
+register_extractor(Extractor(
+    "zpe", "零点能校正(a.u.)", "Zero-point correction=", r"Zero-point correction=\s+([-\d.]+)",
+    source="gibbs", description="零点振动能校正"))
+register_extractor(Extractor(
+    "thermal_energy", "内能校正(a.u.)", "Thermal correction to Energy=",
+    r"Thermal correction to Energy=\s+([-\d.]+)", source="gibbs", description="热校正内能"))
+register_extractor(Extractor(
+    "thermal_enthalpy", "焓校正(a.u.)", "Thermal correction to Enthalpy=",
+    r"Thermal correction to Enthalpy=\s+([-\d.]+)", source="gibbs", description="热校正焓"))
+register_extractor(Extractor(
+    "imaginary", "虚频个数", "Frequencies --", r"Frequencies --\s+(.*)", mode="sum", source="gibbs",
+    parse=count_negative, fmt="{:.0f}", description="频率计算中负频率的个数"))
+register_extractor(Extractor(
+    "mp2", "MP2能量(a.u.)", "EUMP2 =", r"EUMP2 =\s*" + FORTRAN_NUMBER,
+    description="最后一个EUMP2能量"))
+register_extractor(Extractor(
+    "ccsd_t", "CCSD(T)能量(a.u.)", "CCSD(T)=", r"CCSD\(T\)=\s*" + FORTRAN_NUMBER,
+    description="最后一个CCSD(T)能量"))
+register_extractor(Extractor(
+    "scf_termination", "SCF正常结束", " termination", r"(Normal|Error) termination",
+    parse=parse_termination, fmt="{:.0f}", description="SCF文件最后一次结束是否为Normal termination（1/0）"))
+register_extractor(Extractor(
+    "gibbs_termination", "Gibbs正常结束", " termination", r"(Normal|Error) termination", source="gibbs",
+    parse=parse_termination, fmt="{:.0f}", description="Gibbs文件最后一次结束是否为Normal termination（1/0）"))
+
+# 默认提取的物理量
+DEFAULT_QUANTITIES = ("scf", "gibbs")
+
+# 每个文件都附带提取的结束状态（不在界面中列出），用于诊断截断或出错的文件
+TERMINATION_KEY = "_termination"
+TERMINATION_EXTRACTOR = Extractor(
+    TERMINATION_KEY, "结束状态", " termination", r"(Normal|Error) termination", parse=parse_termination,
+    description="最后一次结束是否为Normal termination（1/0）")
+
+# extract_files 的结果中还附带路由部分对应的作业类型（见 job_type），供结果库记录来源
+JOB_KEY = "_job"
+
+# 诊断类别
+DIAGNOSTIC_LABELS = {
+    "io_error": "读取错误",
+    "truncated": "文件截断",
+    "error_termination": "Error termination",
+    "missing_section": "缺少数据段",
+}
+
+
+def as_extractors(patterns, mode="last"):
+    """把 {名称: Extractor 或 (触发文本, 正则表达式)} 统一为 {名称: Extractor}"""
+    return {name: spec if isinstance(spec, Extractor) else Extractor(name, name, spec[0], spec[1], mode)
+            for name, spec in patterns.items()}
+
+
+# 分块扫描的块大小：块内多次 bytes.find 都命中CPU缓存，磁盘上每个字节只读一次
+SCAN_BLOCK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(items):
+    """把 ((名称, 触发文本, 正则), ...) 一次性编译为 {名称: (触发文本bytes, 字节正则)}
+
+    各量分别编译而不合并为一个交替式：交替式在同一位置只能报告一个量，
+    两个量的模式相同或重叠时（如两类文件的结束状态）会漏掉其中一个。
+    """
+    return {name: (trigger.encode('utf-8'), re.compile(regex.encode('utf-8'))) for name, trigger, regex in items}
+
+
+# 支持的压缩格式（按扩展名识别），.zst 需要 Python 3.14+ 或 zstandard 包
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+LOG_SUFFIXES = (".log",) + tuple(".log" + suffix for suffix in COMPRESSED_SUFFIXES)
+
+
+def compression_of(file_path):
+    """返回文件的压缩扩展名，未压缩时返回 None"""
+    suffix = os.path.splitext(file_path)[1].lower()
+    return suffix if suffix in COMPRESSED_SUFFIXES else None
+
+
+def strip_compression(file_path):
+    """去除压缩扩展名，如 a.log.gz -> a.log"""
+    suffix = compression_of(file_path)
+    return file_path[:-len(suffix)] if suffix else file_path
+
+
+def is_log_file(file_path):
+    """是否为Gaussian日志（含压缩日志）"""
+    return file_path.lower().endswith(LOG_SUFFIXES)
+
+
+def open_decompressed(file_path):
+    """以流式解压方式打开文件（二进制），未压缩的文件直接打开"""
+    suffix = compression_of(file_path)
+    if suffix == ".gz":
+        return gzip.open(file_path, 'rb')
+    if suffix == ".bz2":
+        return bz2.open(file_path, 'rb')
+    if suffix == ".xz":
+        return lzma.open(file_path, 'rb')
+    if suffix == ".zst":
+        try:
+            from compression import zstd
+            return zstd.open(file_path, 'rb')
+        except ImportError:
+            import zstandard
+            return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), read_across_frames=True,
+                                                               closefd=True)
+    return open(file_path, 'rb')
+
+
+@contextmanager
+def open_mapped(file_path):
+    """以只读内存映射打开文件（空文件返回 b""）
+
+    映射后的页面在扫描时才从磁盘读入，这部分时间计入 parsing 阶段。
+    """
+    with open(file_path, 'rb') as f:
+        with PROFILER.stage("reading"):
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else None
+        if mm is None:
+            yield b""
+            return
+        with mm:
+            yield mm
+
+
+def _line_bounds(data, pos):
+    """返回 pos 所在行的 (行首, 行尾)"""
+    line_end = data.find(b"\n", pos)
+    return data.rfind(b"\n", 0, pos) + 1, len(data) if line_end < 0 else line_end
+
+
+def _block_matches(data, start, end, name, compiled, reverse):
+    """在 [start, end) 中按顺序（reverse 时倒序）产出名称为 name 的量的匹配
+
+    先用 bytes.find/rfind 跳到含触发文本的行，再只在该行上执行正则；
+    触发文本为空时直接在整块上执行正则。
+    """
+    trigger, regex = compiled[name]
+
+    if not trigger:
+        matches = list(regex.finditer(data, start, end))
+        yield from (reversed(matches) if reverse else matches)
+        return
+
+    pos = data.rfind(trigger, start, end) if reverse else data.find(trigger, start, end)
+    while pos >= 0:
+        line_start, line_end = _line_bounds(data, pos)
+        matches = list(regex.finditer(data, line_start, line_end))
+        yield from (reversed(matches) if reverse else matches)
+        if reverse:
+            pos = data.rfind(trigger, start, line_start) if line_start > start else -1
+        else:
+            pos = data.find(trigger, line_end, end) if line_end < end else -1
+
+
+def scan_data(data, patterns, block_size=SCAN_BLOCK_SIZE, start=0, end=None):
+    """在字节数据（bytes 或 mmap）中一次扫描提取 patterns（{名称: Extractor}）中的所有量
+
+    全部为 last 时从末尾倒序处理，所有量都找到后立即停止，通常只读文件尾部；
+    否则顺序处理全文，first 量找到后不再查找，last/sum 量持续更新。
+    数据按整行对齐的块依次处理，每个块内依次评估所有量，因此增加物理量不会增加读盘次数。
+    start/end 限定扫描范围，须位于行边界。
+    """
+    with PROFILER.stage("parsing"):
+        results, scanned = _scan_data(data, patterns, block_size, start, end)
+    if PROFILER.enabled:
+        PROFILER.count("bytes_scanned", scanned)
+        PROFILER.count("matches", sum(value is not None for value in results.values()))
+    return results
+
+
+def _scan_data(data, patterns, block_size, start, end):
+    """scan_data 的实现，返回 (结果, 实际扫描的字节数)"""
+    extractors = as_extractors(patterns)
+    results = dict.fromkeys(extractors)
+    compiled = compile_patterns(tuple((name, e.trigger, e.regex) for name, e in extractors.items()))
+    reverse = all(e.mode == "last" for e in extractors.values())
+    # pending: 找到一次即可结束的量；running: 需要扫描全文的量
+    pending = [name for name, e in extractors.items() if reverse or e.mode == "first"]
+    running = [name for name, e in extractors.items() if not reverse and e.mode != "first"]
+    end = len(data) if end is None else end
+
+    def value(name, match):
+        return extractors[name].parse(match.group(1 if match.re.groups else 0))
+
+    position = end if reverse else start
+    while (pending or running) and (position > start if reverse else position < end):
+        # 块边界对齐到行首，保证候选行完整落在块内
+        if reverse:
+            block_start = data.rfind(b"\n", start, max(position - block_size, start)) + 1
+            block_start, block_end = max(block_start, start), position
+        else:
+            line_end = data.find(b"\n", min(position + block_size, end), end)
+            block_start, block_end = position, end if line_end < 0 else line_end + 1
+
+        for name in list(pending):
+            for match in _block_matches(data, block_start, block_end, name, compiled, reverse):
+                try:
+                    results[name] = value(name, match)
+                except ValueError:
+                    continue
+                pending.remove(name)
+                break
+
+        for name in running:
+            if extractors[name].mode == "last":
+                # 块内最后一个有效值
+                for match in _block_matches(data, block_start, block_end, name, compiled, True):
+                    try:
+                        results[name] = value(name, match)
+                    except ValueError:
+                        continue
+                    break
+            else:
+                for match in _block_matches(data, block_start, block_end, name, compiled, False):
+                    try:
+                        results[name] = (results[name] or 0.0) + value(name, match)
+                    except ValueError:
+                        continue
+
+        position = block_start if reverse else block_end
+
+    return results, end - position if reverse else position - start
+
+
+def scan_log_tail(file_path, patterns, block_size=SCAN_BLOCK_SIZE, with_job=False):
+    """扫描日志文件，以元组给出的量取最后一次出现的值
+
+    几何优化会输出大量 SCF Done，只有最后一次是收敛结果；热化学数据也位于文件末尾。
+    所有量都取最后一次出现时从末尾倒序扫描，找到后立即停止，通常只需读取文件尾部。
+    有量限定了 Link1 步骤时按分步索引只扫描对应步骤（压缩文件忽略步骤限定）。
+    with_job=True 时在同一次打开中读取开头的路由部分，作业类型记在结果的 JOB_KEY 下。
+    """
+    if compression_of(file_path):
+        return scan_compressed(file_path, as_extractors(patterns, "last"), block_size, with_job)
+    extractors = as_extractors(patterns, "last")
+    if any(e.step for e in extractors.values()):
+        return scan_steps(file_path, extractors, block_size, with_job)
+    with open_mapped(file_path) as data:
+        values = scan_data(data, extractors, block_size)
+        if with_job:
+            values[JOB_KEY] = head_job(data)
+    return values
+
+
+# 压缩日志无法从末尾倒序读取，解压后的尾部（及作业类型）按 (路径, 大小, 修改时间) 缓存在进程内，
+# 之后对同一文件提取其他"最后一次出现"的量时先查尾部，找全即可免去整体解压
+DECOMPRESSED_TAIL_BYTES = 1 << 20
+TAIL_CACHE_ENTRIES = 64
+_tail_cache = OrderedDict()
+# 界面的后台任务与目录导入的线程池会同时访问尾部缓存
+_tail_cache_lock = threading.Lock()
+
+
+def scan_compressed(file_path, extractors, block_size=SCAN_BLOCK_SIZE, with_job=False):
+    """流式解压并扫描压缩日志，返回 {名称: 数值或None}
+
+    按 block_size 解压，每块截到最后一个完整行后扫描，各块结果按取值方式合并；
+    只取首次出现的量全部找到后提前停止解压。with_job=True 时作业类型取自第一块，记在 JOB_KEY 下。
+    """
+    st = os.stat(file_path)
+    key = (file_path, st.st_size, st.st_mtime_ns)
+    only_last = all(e.mode == "last" for e in extractors.values())
+    with _tail_cache_lock:
+        cached = _tail_cache.get(key)
+        if cached is not None:
+            _tail_cache.move_to_end(key)
+    if cached is not None and only_last:
+        values = scan_data(cached[0], extractors, block_size)
+        if all(value is not None for value in values.values()):
+            if with_job:
+                values[JOB_KEY] = cached[1]
+            return values
+
+    only_first = all(e.mode == "first" for e in extractors.values())
+    values = dict.fromkeys(extractors)
+    job = None
+    carry = tail = b""
+    with open_decompressed(file_path) as stream:
+        while True:
+            with PROFILER.stage("reading"):
+                chunk = stream.read(block_size)
+            PROFILER.count("bytes_decompressed", len(chunk))
+            data = carry + chunk
+            if chunk:
+                cut = data.rfind(b"\n") + 1
+                data, carry = data[:cut], data[cut:]
+            if data:
+                if job is None:
+                    job = head_job(data)
+                values = merge_values(extractors, values, scan_data(data, extractors, block_size))
+                tail = (tail + data)[-DECOMPRESSED_TAIL_BYTES:]
+                if only_first and all(value is not None for value in values.values()):
+                    break
+            if not chunk:
+                break
+    job = job or job_type("")
+    if with_job:
+        values[JOB_KEY] = job
+    if only_first and chunk:
+        return values
+
+    with _tail_cache_lock:
+        _tail_cache[key] = (tail, job)
+        _tail_cache.move_to_end(key)
+        while len(_tail_cache) > TAIL_CACHE_ENTRIES:
+            _tail_cache.popitem(last=False)
+    return values
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "gaussian_energy_analysis",
+                                  "parse_cache.sqlite3")
+DEFAULT_DIAGNOSTICS_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "diagnostics.log")
+# 提取逻辑变化时递增，使旧缓存自动失效
+CACHE_VERSION = 2
+
+
+class ParseCache:
+    """持久化解析缓存（SQLite）
+
+    以 (路径, 大小, 修改时间, 文件尾部内容哈希) 判断文件是否变化，
+    以提取模式的签名判断缓存的量是否与本次请求一致。
+    条目数超过 max_entries 时按最近使用时间淘汰（LRU）。
+    """
+
+    TAIL_BYTES = 4096
+    BATCH_SIZE = 500
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, max_entries=200000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # 图形界面在后台线程中使用缓存，调用方保证同一时间只有一个线程访问
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+                                 path TEXT PRIMARY KEY,
+                                 size INTEGER,
+                                 mtime_ns INTEGER,
+                                 tail_hash TEXT,
+                                 signature TEXT,
+                                 vals TEXT,
+                                 last_used REAL)""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON entries (last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def signature(patterns):
+        """提取模式的签名（各物理量的完整定义均参与计算）"""
+        extractors = as_extractors(patterns)
+        text = json.dumps([CACHE_VERSION, sorted(e.signature() for e in extractors.values())])
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    @classmethod
+    def file_key(cls, file_path):
+        """返回 (大小, 修改时间ns, 尾部哈希)"""
+        st = os.stat(file_path)
+        with open(file_path, 'rb') as f:
+            f.seek(max(0, st.st_size - cls.TAIL_BYTES))
+            tail_hash = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        return st.st_size, st.st_mtime_ns, tail_hash
+
+    def get_many(self, file_patterns):
+        """批量查询缓存
+
+        返回 (命中结果 {文件: 提取结果}, 未命中文件的键 {文件: 缓存键})，
+        无法读取的文件两者都不包含，交给提取过程报告错误。
+        """
+        hits = {}
+        keys = {}
+        for file_path, patterns in file_patterns.items():
+            try:
+                keys[file_path] = self.file_key(file_path) + (self.signature(patterns),)
+            except OSError:
+                continue
+
+        paths = list(keys)
+        now = time.time()
+        for start in range(0, len(paths), self.BATCH_SIZE):
+            batch = paths[start:start + self.BATCH_SIZE]
+            rows = self.conn.execute(
+                "SELECT path, size, mtime_ns, tail_hash, signature, vals FROM entries "
+                f"WHERE path IN ({','.join('?' * len(batch))})", batch)
+            for path, size, mtime_ns, tail_hash, signature, vals in rows:
+                if keys[path] == (size, mtime_ns, tail_hash, signature):
+                    hits[path] = json.loads(vals)
+                    del keys[path]
+
+        if hits:
+            self.conn.executemany("UPDATE entries SET last_used = ? WHERE path = ?",
+                                  [(now, path) for path in hits])
+            self.conn.commit()
+        return hits, keys
+
+    def put_many(self, entries):
+        """批量写入 [(文件, 缓存键, 提取结果)]，并按LRU淘汰超出上限的条目"""
+        if not entries:
+            return
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(path,) + tuple(key) + (json.dumps(values), now) for path, key, values in entries])
+
+        count = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM entries WHERE path IN "
+                "(SELECT path FROM entries ORDER BY last_used LIMIT ?)", (count - self.max_entries,))
+        self.conn.commit()
+
+    def clear(self):
+        """清空全部缓存"""
+        self.conn.execute("DELETE FROM entries")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+
+
+# 内容指纹读取的首尾字节数；只有大小相同的不同文件才需要计算
+FINGERPRINT_BYTES = 4096
+
+
+def content_fingerprint(file_path, size):
+    """文件内容指纹：首尾各 FINGERPRINT_BYTES 字节与大小的哈希
+
+    只用于快速排除内容不同的文件；指纹相同的文件须再逐字节比较（见 dedupe_files）。
+    """
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+        if size > FINGERPRINT_BYTES:
+            f.seek(max(FINGERPRINT_BYTES, size - FINGERPRINT_BYTES))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def dedupe_files(file_patterns):
+    """合并指向同一物理文件（符号链接、硬链接、不同写法的路径）或内容相同的文件
+
+    先按 (设备, inode) 合并；大小与内容指纹都相同的文件再逐字节比较全文，完全相同时才合并。
+    返回 (去重后的 {代表文件: 合并后的 patterns}, {被合并的文件: 代表文件})；
+    代表文件为最先出现的路径，无法读取的文件保持原样，交给提取过程报告错误。
+    """
+    unique = {}
+    aliases = {}
+    by_inode = {}
+    by_size = {}
+    for file_path, patterns in file_patterns.items():
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            unique[file_path] = dict(patterns)
+            continue
+        representative = by_inode.setdefault((st.st_dev, st.st_ino), file_path)
+        if representative == file_path:
+            by_size.setdefault(st.st_size, []).append(file_path)
+            unique[file_path] = dict(patterns)
+        else:
+            aliases[file_path] = representative
+            unique[representative].update(patterns)
+
+    for size, files in by_size.items():
+        if len(files) < 2:
+            continue
+        by_content = {}
+        for file_path in files:
+            try:
+                candidates = by_content.setdefault(content_fingerprint(file_path, size), [])
+                representative = next((c for c in candidates if filecmp.cmp(c, file_path, shallow=False)), None)
+            except OSError:
+                continue
+            if representative is None:
+                candidates.append(file_path)
+            else:
+                aliases[file_path] = representative
+                unique[representative].update(unique.pop(file_path))
+
+    # 代表文件本身也可能被合并到更早的文件
+    for file_path, representative in aliases.items():
+        while representative in aliases:
+            representative = aliases[representative]
+        aliases[file_path] = representative
+    return unique, aliases
+
+
+def extract_chunk_worker(tasks, profile=False):
+    """进程池任务：提取一批文件，返回 ([(文件路径, 提取结果, 错误, 文件大小)], 性能统计)
+
+    错误为 None 或 (诊断类别, 说明)。
+
+    profile=True 时在工作进程中开启性能统计，并把本组的记录返回给主进程合并。
+    """
+    if profile:
+        # fork 出的工作进程会继承主进程已有的记录，先清空
+        PROFILER.reset()
+        PROFILER.enable()
+    results = []
+    for file_path, patterns in tasks:
+        try:
+            size = os.path.getsize(file_path)
+            results.append((file_path, scan_log_tail(file_path, patterns, with_job=True), None, size))
+        except EOFError as e:
+            # 压缩流在结束标记之前中断
+            results.append((file_path, dict.fromkeys(patterns), ("truncated", str(e)), 0))
+        except Exception as e:
+            results.append((file_path, dict.fromkeys(patterns), ("io_error", str(e) or type(e).__name__), 0))
+    if not profile:
+        return results, None
+    PROFILER.disable()
+    return results, PROFILER.take()
+
+
+def extract_files(file_patterns, workers=1, chunk_size=64, cache=None, progress=None, cancelled=None):
+    """并行提取 {文件: patterns}，返回 (结果 {文件: 提取结果}, 读取失败的文件 {文件: (诊断类别, 说明)})
+
+    指向同一物理文件或内容相同的文件只扫描一次（见 dedupe_files），各自请求的量在一次扫描中提取。
+    任务按 chunk_size 个文件一组提交到进程池，同时在途的任务组数量有限。
+    progress(已完成数, 总数, 已读取字节数) 在每组完成及等待期间被调用（命中缓存的
+    文件不计字节）；cancelled() 为真时
+    停止提交并返回 (None, 失败列表)。已完成的结果即使被取消也会写入 cache。
+    每个文件的结果还附带作业类型（JOB_KEY）。
+    """
+    requested = file_patterns
+    file_patterns, aliases = dedupe_files(requested)
+    PROFILER.count("deduplicated", len(aliases))
+    results, errors = _extract_unique(file_patterns, workers, chunk_size, cache, progress, cancelled)
+    if results is None:
+        return None, errors
+    for file_path, representative in aliases.items():
+        results[file_path] = {name: results[representative].get(name)
+                              for name in list(requested[file_path]) + [JOB_KEY]}
+        if representative in errors:
+            errors[file_path] = errors[representative]
+    return results, errors
+
+
+def _extract_unique(file_patterns, workers=1, chunk_size=64, cache=None, progress=None, cancelled=None,
+                    executor=None):
+    """extract_files 的实现（文件已去重）；executor 为调用方持有的进程池，多次调用可共用，不会被关闭"""
+    results = {}
+    errors = {}
+    cache_keys = {}
+    if cache:
+        with PROFILER.stage("cache_lookup"):
+            results, cache_keys = cache.get_many(file_patterns)
+    PROFILER.count("files", len(file_patterns))
+    PROFILER.count("cache_hits", len(results))
+    PROFILER.count("cache_misses", len(file_patterns) - len(results))
+    new_entries = []
+    bytes_read = 0
+
+    tasks = [(path, patterns) for path, patterns in file_patterns.items() if path not in results]
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+    def collect(chunk_output):
+        nonlocal bytes_read
+        chunk_results, profile = chunk_output
+        if profile:
+            PROFILER.merge(profile)
+        for file_path, values, error, size in chunk_results:
+            results[file_path] = values
+            bytes_read += size
+            if error:
+                errors[file_path] = error
+                PROFILER.count("errors")
+            elif file_path in cache_keys:
+                new_entries.append((file_path, cache_keys[file_path], values))
+        if progress:
+            progress(len(results), len(file_patterns), bytes_read)
+
+    def is_cancelled():
+        return cancelled is not None and cancelled()
+
+    try:
+        if executor is None and (workers <= 1 or len(chunks) < 2):
+            for chunk in chunks:
+                collect(extract_chunk_worker(chunk))
+                if is_cancelled():
+                    return None, errors
+        else:
+            with nullcontext(executor) if executor else ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                next_chunk = 0
+                while next_chunk < len(chunks) or pending:
+                    # 保持每个进程最多两组在途任务
+                    while next_chunk < len(chunks) and len(pending) < workers * 2:
+                        pending.add(pool.submit(extract_chunk_worker, chunks[next_chunk], PROFILER.enabled))
+                        next_chunk += 1
+
+                    done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                    if not done and progress:
+                        progress(len(results), len(file_patterns), bytes_read)
+
+                    if is_cancelled():
+                        for future in pending:
+                            future.cancel()
+                        return None, errors
+    finally:
+        if cache:
+            with PROFILER.stage("cache_store"):
+                cache.put_many(new_entries)
+
+    if progress and not chunks:
+        progress(len(results), len(file_patterns), bytes_read)
+    return results, errors
+
+
+def diagnose_file(values, patterns, error=None):
+    """由提取结果判断文件的问题，返回 (诊断类别, 说明) 或 None（正常）
+
+    依次检查：读取错误、没有任何结束标记（截断）、最后一次结束为 Error termination、
+    请求的量未找到（缺少数据段）。
+    """
+    if error:
+        return tuple(error)
+    termination = values.get(TERMINATION_KEY, 1.0) if TERMINATION_KEY in patterns else 1.0
+    if termination is None:
+        return "truncated", "没有 Normal/Error termination 行"
+    if termination == 0:
+        return "error_termination", "最后一次结束为 Error termination"
+    missing = [extractor.label for name, extractor in as_extractors(patterns).items()
+               if name != TERMINATION_KEY and values.get(name) is None]
+    if missing:
+        return "missing_section", "未找到: " + "、".join(missing)
+    return None
+
+
+def diagnose_files(file_patterns, file_values, errors=None):
+    """诊断所有文件，只返回有问题的文件 {文件: (诊断类别, 说明)}，按 file_patterns 的顺序"""
+    errors = errors or {}
+    diagnostics = {}
+    for file_path, patterns in file_patterns.items():
+        diagnosis = diagnose_file(file_values.get(file_path, {}), patterns, errors.get(file_path))
+        if diagnosis:
+            diagnostics[file_path] = diagnosis
+    return diagnostics
+
+
+def diagnostics_summary(diagnostics):
+    """诊断结果按类别计数的简短说明"""
+    counts = {}
+    for category, _ in diagnostics.values():
+        counts[category] = counts.get(category, 0) + 1
+    return "，".join(f"{DIAGNOSTIC_LABELS[category]} {counts[category]} 个"
+                    for category in DIAGNOSTIC_LABELS if category in counts)
+
+
+def write_diagnostics(diagnostics, output_file):
+    """写出诊断日志：每个有问题的文件一行，制表符分隔（类别、文件、说明）"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(f"# {time.strftime('%Y-%m-%d %H:%M:%S')}  {diagnostics_summary(diagnostics) or '没有问题'}\n")
+        for file_path, (category, detail) in diagnostics.items():
+            f.write(f"{category}\t{file_path}\t{detail}\n")
+
+
+def merge_values(extractors, old, new):
+    """合并同一文件先后两段内容的提取结果"""
+    merged = {}
+    for name, extractor in extractors.items():
+        if extractor.mode == "sum" and old.get(name) is not None and new[name] is not None:
+            merged[name] = old[name] + new[name]
+        elif extractor.mode == "first" and old.get(name) is not None:
+            merged[name] = old[name]
+        else:
+            merged[name] = new[name] if new[name] is not None else old.get(name)
+    return merged
+
+
+class IncrementalScanner:
+    """增量扫描：记录每个文件已解析到的字节偏移，之后只解析新追加的完整行
+
+    大小与修改时间都未变的文件不重新打开。文件变短、开头内容变化（被重写）或提取的量变化时
+    从头重新解析；压缩文件在变化时整体重新解析。
+    link1=True 时（patterns 由 collect_file_patterns(..., link1=True) 生成）含 Link1 步骤的文件
+    在变化时按分步索引重新提取，与 extract_files 的结果一致；不含 Link1 步骤的文件仍增量解析。
+    """
+
+    HEAD_BYTES = 1024
+
+    def __init__(self, link1=False):
+        self.link1 = link1
+        # 文件 -> {"stamp", "offset", "head", "signature", "values", "steps"}
+        self.states = {}
+
+    def update(self, file_path, patterns):
+        """解析文件新增内容，返回 (提取结果, 是否有变化)"""
+        extractors = as_extractors(patterns)
+        signature = ParseCache.signature(extractors)
+        state = self.states.get(file_path)
+        st = os.stat(file_path)
+        stamp = (st.st_size, st.st_mtime_ns)
+        if state is not None and state["signature"] == signature and state["stamp"] == stamp:
+            return state["values"], False
+        previous = state["values"] if state else None
+
+        if compression_of(file_path):
+            # 压缩文件无法按偏移续读，大小或修改时间变化时整体重新解析
+            state = {"stamp": stamp, "signature": signature, "values": scan_compressed(file_path, extractors)}
+            self.states[file_path] = state
+            return state["values"], state["values"] != previous
+
+        if state is not None and state["signature"] == signature and state.get("steps"):
+            # Link1 多步日志：新增内容可能开始新的步骤，按重建的分步索引重新提取
+            state.update(stamp=stamp, values=scan_steps(file_path, extractors))
+            return state["values"], state["values"] != previous
+
+        with open_mapped(file_path) as data:
+            if (state is None or state["signature"] != signature or len(data) < state["offset"]
+                    or data[:len(state["head"])] != state["head"]):
+                state = {"offset": 0, "head": b"", "signature": signature, "values": dict.fromkeys(extractors)}
+                self.states[file_path] = state
+            state["stamp"] = stamp
+
+            # 只处理到最后一个完整行，未写完的行留到下次
+            end = data.rfind(b"\n", state["offset"]) + 1
+            if end > state["offset"]:
+                if self.link1 and data.find(LINK1_MARKER, state["offset"], end) >= 0:
+                    state["steps"] = True
+                else:
+                    new_values = scan_data(data, extractors, start=state["offset"], end=end)
+                    state["values"] = merge_values(extractors, state["values"], new_values)
+                    state["offset"] = end
+                    if len(state["head"]) < self.HEAD_BYTES:
+                        state["head"] = data[:min(self.HEAD_BYTES, end)]
+
+        if state.get("steps"):
+            state["values"] = scan_steps(file_path, extractors)
+        return state["values"], state["values"] != previous
+
+    def update_many(self, file_patterns):
+        """增量解析多个文件，返回 ({有变化的文件: 提取结果}, 读取失败的文件列表)"""
+        changed = {}
+        errors = []
+        for file_path, patterns in file_patterns.items():
+            try:
+                values, is_changed = self.update(file_path, patterns)
+            except (OSError, EOFError, ValueError):
+                self.states.pop(file_path, None)
+                errors.append(file_path)
+                continue
+            if is_changed:
+                changed[file_path] = values
+        return changed, errors
+
+
+# 结果表中固定的列
+NAME_COLUMN = "文件名"
+TOTAL_COLUMN = "总能量(a.u.)"
+
+# Boltzmann 分析追加的列（见 gaussian_analysis）
+GROUP_COLUMN = "分组"
+RELATIVE_COLUMN = "相对能量(kcal/mol)"
+WEIGHT_COLUMN = "Boltzmann权重"
+WEIGHTED_PREFIX = "加权"
+DEFAULT_TEMPERATURE = 298.15
+
+
+def is_analysis_column(col):
+    """是否为 Boltzmann 分析追加的列"""
+    return col in (GROUP_COLUMN, RELATIVE_COLUMN, WEIGHT_COLUMN) or col.startswith(WEIGHTED_PREFIX)
+
+
+def result_columns(quantities=DEFAULT_QUANTITIES):
+    """所选物理量对应的结果列；同时选择SCF与Gibbs时追加总能量列"""
+    columns = [NAME_COLUMN] + [EXTRACTORS[name].label for name in quantities]
+    if "scf" in quantities and "gibbs" in quantities:
+        columns.append(TOTAL_COLUMN)
+    return columns
+
+
+def column_descriptions(columns):
+    """结果列的说明文字（用于导出的说明页）"""
+    descriptions = {NAME_COLUMN: "去除'sp_'前缀的文件名", TOTAL_COLUMN: "SCF能量与Gibbs校正之和",
+                    GROUP_COLUMN: "由分组正则从文件名得到的构象组",
+                    RELATIVE_COLUMN: "相对组内最低能量的能量差",
+                    WEIGHT_COLUMN: "组内Boltzmann布居（组内之和为1）"}
+    descriptions.update((e.label, e.description) for e in EXTRACTORS.values())
+    for col in columns:
+        if col not in descriptions and col.startswith(WEIGHTED_PREFIX):
+            descriptions[col] = f"组内按Boltzmann权重加权平均的{col[len(WEIGHTED_PREFIX):]}"
+    return {col: descriptions.get(col, "") for col in columns}
+
+
+# 默认结果列
+COLUMNS = result_columns()
+
+
+def molecule_name(scf_file):
+    """由SCF文件路径得到分子名称（去除'sp_'前缀与扩展名）"""
+    stem = file_stem(scf_file)
+    return stem[3:] if stem.startswith("sp_") else stem
+
+
+# 作业类型按路由行中的关键词判断，没有这些关键词的视为单点计算
+JOB_KEYWORDS = ("opt", "freq", "irc", "scan")
+ROUTE_HEAD_BYTES = 64 * 1024
+ROUTE_MAX_LINES = 8
+
+
+def read_route(file_path, head_bytes=ROUTE_HEAD_BYTES):
+    """读取日志开头的路由部分（'#' 开头，可跨多行，到下一条虚线为止），未找到时返回 ''"""
+    with open_decompressed(file_path) as f:
+        head = b"\n" + f.read(head_bytes)
+    return find_route(head, 0, len(head))[2]
+
+
+def head_job(data):
+    """由日志开头（bytes 或 mmap）的路由部分判断作业类型"""
+    return job_type(find_route(data, 0, min(len(data), ROUTE_HEAD_BYTES))[2])
+
+
+def find_route(data, start, end):
+    """在 [start, end)（start 须为行首）中查找路由部分，返回 (开始, 结束, 文本)；未找到时为 (-1, -1, '')"""
+    if data[start:start + 2] == b" #":
+        pos = start
+    else:
+        pos = data.find(b"\n #", start, end)
+        if pos < 0:
+            return -1, -1, ""
+        pos += 1
+    lines = []
+    stop = pos
+    # 路由行不超过80列，只取足够容纳 ROUTE_MAX_LINES 行的字节
+    window = bytes(data[pos:min(end, pos + ROUTE_MAX_LINES * 128)])
+    for line in window.split(b"\n", ROUTE_MAX_LINES)[:ROUTE_MAX_LINES]:
+        if line.startswith(b" --") or (lines and not line.strip()):
+            break
+        lines.append(line.strip())
+        stop += len(line) + 1
+    return pos, min(stop, end), b"".join(lines).decode("ascii", "replace")
+
+
+def job_type(route):
+    """由路由部分判断作业类型，如 'opt freq'、'sp'；没有路由部分时为 'unknown'"""
+    if not route:
+        return "unknown"
+    words = re.findall(r"[a-z]+", route.lower())
+    return " ".join(keyword for keyword in JOB_KEYWORDS if keyword in words) or "sp"
+
+
+# ---------------------------------------------------------------- Link1 分步索引
+# Link1 多步作业（如 opt -> freq -> 高精度单点）中，每一步以该行开始
+LINK1_MARKER = b"Proceeding to internal job step"
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".gidx"
+# 日志所在目录不可写时索引保存在此目录
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "indexes")
+# 段落: (开始标记, 结束标记)，段落从第一个开始标记所在行到其后最后一个结束标记所在行
+INDEX_SECTIONS = {
+    "scf": (b"SCF Done:", b"SCF Done:"),
+    "thermochemistry": (b"- Thermochemistry -", b"Sum of electronic and thermal Free Energies"),
+    "termination": (b" termination", b" termination"),
+}
+# 触发文本 -> 所在段落；这些量只在所选步骤的对应段落中查找
+TRIGGER_SECTIONS = {
+    "SCF Done:": "scf",
+    "Zero-point correction=": "thermochemistry",
+    "Thermal correction to Energy=": "thermochemistry",
+    "Thermal correction to Enthalpy=": "thermochemistry",
+    "Thermal correction to Gibbs Free Energy": "thermochemistry",
+    " termination": "termination",
+}
+
+
+def build_index(file_path):
+    """扫描全文，记录每个 Link1 步骤及其路由、SCF、热化学与结束段落的字节偏移
+
+    返回 {"version", "size", "mtime_ns", "steps": [{"start", "end", "route", "job", "sections"}]}，
+    sections 为 {段落: [开始, 结束]}，未出现的段落不记录。只支持未压缩的日志。
+    """
+    st = os.stat(file_path)
+    steps = []
+    with open_mapped(file_path) as data:
+        starts = [0]
+        pos = data.find(LINK1_MARKER)
+        while pos >= 0:
+            line_start, line_end = _line_bounds(data, pos)
+            starts.append(line_start)
+            pos = data.find(LINK1_MARKER, line_end)
+
+        for start, end in zip(starts, starts[1:] + [len(data)]):
+            sections = {}
+            route_start, route_end, route = find_route(data, start, end)
+            if route_start >= 0:
+                sections["route"] = [route_start, route_end]
+            for name, (first_marker, last_marker) in INDEX_SECTIONS.items():
+                first = data.find(first_marker, start, end)
+                if first < 0:
+                    continue
+                last = data.rfind(last_marker, first, end)
+                section_end = min(_line_bounds(data, last)[1] + 1, end) if last >= 0 else end
+                sections[name] = [_line_bounds(data, first)[0], section_end]
+            steps.append({"start": start, "end": end, "route": route, "job": job_type(route), "sections": sections})
+    return {"version": INDEX_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "steps": steps}
+
+
+def index_paths(file_path):
+    """索引文件的候选位置：日志旁的隐藏 sidecar 文件（.名称.gidx），以及缓存目录中的副本"""
+    directory, name = os.path.split(file_path)
+    digest = hashlib.blake2b(os.path.abspath(file_path).encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(directory, f".{name}{INDEX_SUFFIX}"), os.path.join(DEFAULT_INDEX_DIR, digest + INDEX_SUFFIX)
+
+
+def load_index(file_path):
+    """读取与日志当前大小、修改时间一致的索引，没有时返回 None"""
+    st = os.stat(file_path)
+    for index_path in index_paths(file_path):
+        try:
+            with open(index_path, encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if (index.get("version"), index.get("size"), index.get("mtime_ns")) == \
+                (INDEX_VERSION, st.st_size, st.st_mtime_ns):
+            return index
+    return None
+
+
+def save_index(file_path, index):
+    """把索引写到日志旁，目录不可写时写到缓存目录；返回写入的路径"""
+    sidecar, fallback = index_paths(file_path)
+    try:
+        with open(sidecar, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        return sidecar
+    except OSError:
+        os.makedirs(DEFAULT_INDEX_DIR, exist_ok=True)
+        with open(fallback, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        return fallback
+
+
+def log_index(file_path):
+    """返回日志的分步索引：有效的已存索引直接读取，否则建立并保存（保存失败不影响返回）"""
+    index = load_index(file_path)
+    if index is None:
+        index = build_index(file_path)
+        try:
+            save_index(file_path, index)
+        except OSError:
+            pass
+    return index
+
+
+def select_step(index, step):
+    """按 Extractor.step 选择步骤；step 为 None 时返回 None（全文）
+
+    "last" 为最后一步；作业关键词（如 "freq"）为最后一个含该关键词的步骤，没有时为最后一步。
+    """
+    if step is None:
+        return None
+    steps = index["steps"]
+    if step == "last":
+        return steps[-1]
+    return next((s for s in reversed(steps) if step in s["job"].split()), steps[-1])
+
+
+def extractor_bounds(index, extractor):
+    """量的扫描范围 (开始, 结束)：所选步骤中对应的段落，没有该段落时为整个步骤；不限定步骤时为 None"""
+    step = select_step(index, extractor.step)
+    if step is None:
+        return None
+    section = step["sections"].get(TRIGGER_SECTIONS.get(extractor.trigger))
+    return tuple(section) if section else (step["start"], step["end"])
+
+
+def scan_steps(file_path, extractors, block_size=SCAN_BLOCK_SIZE, with_job=False):
+    """按分步索引直接跳到每个量所在步骤的段落扫描，返回 {名称: 数值或None}
+
+    with_job=True 时作业类型取自索引中第一步的路由部分，记在 JOB_KEY 下。
+    """
+    index = log_index(file_path)
+    groups = {}
+    for name, extractor in extractors.items():
+        groups.setdefault(extractor_bounds(index, extractor), {})[name] = extractor
+    values = {}
+    with open_mapped(file_path) as data:
+        for bounds, group in groups.items():
+            start, end = bounds or (0, len(data))
+            values.update(scan_data(data, group, block_size, start, end))
+    if with_job:
+        values[JOB_KEY] = job_type(index["steps"][0]["route"])
+    return values
+
+
+def collect_file_patterns(scf_files, gibbs_files, quantities=DEFAULT_QUANTITIES, link1=False):
+    """汇总每个文件需要提取的量，保证每个文件只扫描一次
+
+    每个量按其 source 从SCF文件或Gibbs文件提取；SCF与Gibbs指向同一文件时合并为一次扫描。
+    每个文件还附带结束状态（TERMINATION_KEY），供 diagnose_files 判断截断与出错的文件。
+    link1=True 时按 Link1 步骤提取：Gibbs 类的量取自最后一个频率计算步骤，其余取自最后一步。
+    """
+    file_patterns = {}
+    termination = TERMINATION_EXTRACTOR.scoped("last") if link1 else TERMINATION_EXTRACTOR
+    for i, scf_file in enumerate(scf_files):
+        gibbs_file = gibbs_files[i] if i < len(gibbs_files) else None
+        for name in quantities:
+            extractor = EXTRACTORS[name]
+            file_path = gibbs_file if extractor.source == "gibbs" else scf_file
+            if link1:
+                extractor = extractor.scoped("freq" if extractor.source == "gibbs" else "last")
+            if file_path:
+                file_patterns.setdefault(file_path, {TERMINATION_KEY: termination})[name] = extractor
+    return file_patterns
+
+
+def build_columns(scf_files, gibbs_files, file_values, quantities=DEFAULT_QUANTITIES):
+    """按SCF文件顺序组装结果列，返回 (分子名称列表, {物理量名称: 数值列表})，缺失值为 None"""
+    names = []
+    values = {name: [] for name in quantities}
+    for i, scf_file in enumerate(scf_files):
+        # 获取文件名 - 以SCF文件名为准
+        names.append(molecule_name(scf_file) if scf_file else "")
+
+        # 按来源取对应文件的值
+        gibbs_file = gibbs_files[i] if i < len(gibbs_files) else None
+        for name in quantities:
+            file_path = gibbs_file if EXTRACTORS[name].source == "gibbs" else scf_file
+            values[name].append(file_values[file_path].get(name) if file_path else None)
+    return names, values
+
+
+def build_rows(scf_files, gibbs_files, file_values, quantities=DEFAULT_QUANTITIES):
+    """按SCF文件顺序组装结果行（字典列表，键为 result_columns(quantities)）"""
+    names, values = build_columns(scf_files, gibbs_files, file_values, quantities)
+    return columns_to_rows(names, values, quantities)
+
+
+def columns_to_rows(names, values, quantities=DEFAULT_QUANTITIES):
+    """把 build_columns 形式的结果列转换为结果行"""
+    with_total = TOTAL_COLUMN in result_columns(quantities)
+    rows = []
+    for i, name in enumerate(names):
+        row = {NAME_COLUMN: name}
+        row.update((EXTRACTORS[q].label, values[q][i]) for q in quantities)
+        if with_total:
+            # 计算总能量（如果两项都存在）
+            scf_value, gibbs_value = values["scf"][i], values["gibbs"][i]
+            row[TOTAL_COLUMN] = scf_value + gibbs_value if scf_value is not None and gibbs_value is not None else None
+        rows.append(row)
+    return rows
+
+
+# 流式提取时每批的文件对数：内存中只保留一批的提取结果与结果行
+STREAM_BATCH_PAIRS = 2048
+
+
+def stream_rows(scf_files, gibbs_files, quantities=DEFAULT_QUANTITIES, link1=False, workers=1, chunk_size=64,
+                cache=None, batch_size=STREAM_BATCH_PAIRS, progress=None, cancelled=None, errors=None,
+                diagnostics=None):
+    """按 batch_size 对文件分批提取，逐批产生结果行（与 build_rows 的行相同、顺序相同）
+
+    每批提取完即交给调用方写出，提取结果、错误与结果行只保留一批（被后面批次再次用到的文件保留到
+    最后一次使用）。文件路径、去重（见 dedupe_files，对全部文件一次完成）与各文件最后使用批次的记录
+    仍与文件数成正比。整个过程共用一个进程池。
+    progress(已完成文件对数, 总数) 在每批完成后调用；cancelled() 为真时生成器提前结束。
+    errors、diagnostics 为字典时，读取失败的文件与有问题的文件（见 diagnose_files）分别写入其中。
+    """
+    total = len(scf_files)
+    gibbs_files = [gibbs_files[i] if i < len(gibbs_files) else None for i in range(total)]
+    file_patterns = collect_file_patterns(scf_files, gibbs_files, quantities, link1)
+    unique, aliases = dedupe_files(file_patterns)
+    PROFILER.count("deduplicated", len(aliases))
+    # 每个代表文件最后被用到的批次，该批写出后释放其结果
+    last_batch = {}
+    for i in range(total):
+        for file_path in (scf_files[i], gibbs_files[i]):
+            if file_path:
+                last_batch[aliases.get(file_path, file_path)] = i // batch_size
+
+    kept = {}
+    failed = {}
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for batch, start in enumerate(range(0, total, batch_size)):
+            scf_batch, gibbs_batch = scf_files[start:start + batch_size], gibbs_files[start:start + batch_size]
+            batch_files = list(dict.fromkeys(f for pair in zip(scf_batch, gibbs_batch) for f in pair if f))
+            representatives = list(dict.fromkeys(aliases.get(f, f) for f in batch_files))
+            values, batch_errors = _extract_unique({f: unique[f] for f in representatives if f not in kept},
+                                                   workers, chunk_size, cache, cancelled=cancelled,
+                                                   executor=executor)
+            if values is None:
+                return
+            kept.update(values)
+            failed.update(batch_errors)
+
+            file_values = {f: kept[aliases.get(f, f)] for f in batch_files}
+            batch_errors = {f: failed[aliases.get(f, f)] for f in batch_files if aliases.get(f, f) in failed}
+            if errors is not None:
+                errors.update(batch_errors)
+            if diagnostics is not None:
+                diagnostics.update(diagnose_files({f: file_patterns[f] for f in batch_files}, file_values,
+                                                  batch_errors))
+            yield build_rows(scf_batch, gibbs_batch, file_values, quantities)
+            for f in representatives:
+                if last_batch[f] == batch:
+                    kept.pop(f, None)
+                    failed.pop(f, None)
+            if progress:
+                progress(start + len(scf_batch), total)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def file_stem(file_path):
+    """去除目录、压缩扩展名与扩展名后的文件名"""
+    return os.path.splitext(os.path.basename(strip_compression(file_path)))[0]
+
+
+def strip_affixes(stem, prefixes=(), suffixes=()):
+    """去除第一个匹配的前缀与后缀"""
+    for prefix in prefixes:
+        if prefix and stem.startswith(prefix):
+            stem = stem[len(prefix):]
+            break
+    for suffix in suffixes:
+        if suffix and stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+            break
+    return stem
+
+
+class AffixRule:
+    """去除前缀/后缀后按文件名主干配对，如 'sp_X.log' <-> 'X_freq.log'"""
+
+    def __init__(self, scf_prefixes=("sp_",), scf_suffixes=(), gibbs_prefixes=(), gibbs_suffixes=()):
+        self.scf_prefixes = tuple(scf_prefixes)
+        self.scf_suffixes = tuple(scf_suffixes)
+        self.gibbs_prefixes = tuple(gibbs_prefixes)
+        self.gibbs_suffixes = tuple(gibbs_suffixes)
+
+    def scf_key(self, file_path):
+        return strip_affixes(file_stem(file_path), self.scf_prefixes, self.scf_suffixes)
+
+    def gibbs_key(self, file_path):
+        return strip_affixes(file_stem(file_path), self.gibbs_prefixes, self.gibbs_suffixes)
+
+
+class RegexRule:
+    """用正则捕获组构造配对键，未匹配的文件不参与此规则"""
+
+    def __init__(self, scf_regex, gibbs_regex=None):
+        self.scf_regex = re.compile(scf_regex)
+        self.gibbs_regex = re.compile(gibbs_regex or scf_regex)
+
+    @staticmethod
+    def _key(regex, file_path):
+        match = regex.search(os.path.basename(file_path))
+        if not match:
+            return None
+        return match.groups() or match.group(0)
+
+    def scf_key(self, file_path):
+        return self._key(self.scf_regex, file_path)
+
+    def gibbs_key(self, file_path):
+        return self._key(self.gibbs_regex, file_path)
+
+
+class DirectoryRule:
+    """平行目录布局：相对各自根目录的子目录相同且内层规则的键相同才配对
+
+    如 sp/mol1/sp_a.log <-> freq/mol1/a.log
+    """
+
+    def __init__(self, scf_root, gibbs_root, rule):
+        self.scf_root = os.path.abspath(scf_root)
+        self.gibbs_root = os.path.abspath(gibbs_root)
+        self.rule = rule
+
+    @staticmethod
+    def _subdir(root, file_path):
+        subdir = os.path.relpath(os.path.dirname(os.path.abspath(file_path)), root)
+        return None if subdir.startswith(os.pardir) else subdir
+
+    def scf_key(self, file_path):
+        subdir = self._subdir(self.scf_root, file_path)
+        key = self.rule.scf_key(file_path)
+        return None if subdir is None or key is None else (subdir, key)
+
+    def gibbs_key(self, file_path):
+        subdir = self._subdir(self.gibbs_root, file_path)
+        key = self.rule.gibbs_key(file_path)
+        return None if subdir is None or key is None else (subdir, key)
+
+
+def build_match_rules(scf_prefixes=("sp_",), scf_suffixes=(), gibbs_prefixes=(), gibbs_suffixes=(),
+                      scf_regex=None, gibbs_regex=None, scf_root=None, gibbs_root=None):
+    """按配置构造匹配规则列表（按顺序尝试，先命中者生效）"""
+    rules = []
+    if scf_regex:
+        rules.append(RegexRule(scf_regex, gibbs_regex))
+    rules.append(AffixRule(scf_prefixes, scf_suffixes, gibbs_prefixes, gibbs_suffixes))
+    if scf_root and gibbs_root:
+        rules = [DirectoryRule(scf_root, gibbs_root, rule) for rule in rules]
+    return rules
+
+
+DEFAULT_MATCH_RULES = build_match_rules()
+
+
+@PROFILER.timed("matching")
+def match_files(scf_files, gibbs_files, rules=None):
+    """根据文件名匹配SCF和Gibbs文件
+
+    先为每条规则建立 {键: [Gibbs文件]} 的字典索引，再对每个SCF文件按规则顺序查找，
+    整体为 O(n)。返回 (新SCF列表, 新Gibbs列表, 报告)，报告包含:
+        unmatched  - 未找到对应Gibbs文件的SCF文件名
+        ambiguous  - {SCF文件: 候选Gibbs文件列表}（取第一个候选）
+        duplicates - {Gibbs文件: 匹配到它的SCF文件列表}（同一Gibbs文件被多次使用）
+    未匹配的Gibbs文件追加到末尾，对应SCF位置为 None。
+    """
+    rules = DEFAULT_MATCH_RULES if rules is None else rules
+    # 忽略上一次匹配留下的空位
+    scf_files = [f for f in scf_files if f]
+    gibbs_files = [f for f in gibbs_files if f]
+
+    indexes = []
+    for rule in rules:
+        index = {}
+        for gibbs_file in gibbs_files:
+            key = rule.gibbs_key(gibbs_file)
+            if key is not None:
+                index.setdefault(key, []).append(gibbs_file)
+        indexes.append(index)
+
+    new_gibbs_files = []
+    unmatched = []
+    ambiguous = {}
+    users = {}
+
+    for scf_file in scf_files:
+        match = None
+        for rule, index in zip(rules, indexes):
+            key = rule.scf_key(scf_file)
+            candidates = index.get(key) if key is not None else None
+            if candidates:
+                match = candidates[0]
+                if len(candidates) > 1:
+                    ambiguous[scf_file] = candidates
+                break
+
+        new_gibbs_files.append(match)
+        if match:
+            users.setdefault(match, []).append(scf_file)
+        else:
+            unmatched.append(os.path.basename(scf_file))
+
+    # 添加未匹配的Gibbs文件
+    for gibbs_file in gibbs_files:
+        if gibbs_file not in users:
+            new_gibbs_files.append(gibbs_file)
+            scf_files.append(None)  # 添加对应的SCF空值
+
+    report = {
+        "unmatched": unmatched,
+        "ambiguous": ambiguous,
+        "duplicates": {f: names for f, names in users.items() if len(names) > 1},
+    }
+    return scf_files, new_gibbs_files, report
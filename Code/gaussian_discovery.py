@@ -0,0 +1,144 @@
+"""目录导入：用 os.scandir 递归查找日志，按文件名过滤、检查正常结束并按路由部分分类
+
+    result = discover_logs(["project/"], pattern="*_conf*", workers=8)
+    scf_files, gibbs_files, report = match_files(result["scf"], result["gibbs"], rules)
+
+各顶层子目录可由线程池并行遍历（目录遍历与读取文件首尾都以I/O为主，线程即可并行）。
+压缩日志的检查经由 gaussian_core.scan_compressed，其进程内尾部缓存有锁保护，可在多个线程中同时调用；
+_inspect 只把读取失败归入 errors，其他异常照常抛出。
+"""
+import fnmatch
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from gaussian_core import EXTRACTORS, compression_of, is_log_file, job_type, read_route, scan_log_tail
+
+
+# 检查正常结束时读取的文件尾部字节数（Normal termination 通常是最后一行）
+TERMINATION_TAIL_BYTES = 4096
+
+# 分类结果：单点计算作为SCF文件，含频率计算的作为Gibbs文件，其余（仅优化、无路由部分等）不导入
+DISCOVERY_KINDS = ("scf", "gibbs", "other", "incomplete", "errors")
+
+
+def name_filter(pattern=None, regex=False):
+    """文件名过滤函数：pattern 为通配符（匹配文件名）或正则表达式（在完整路径中搜索）；为空时接受全部日志"""
+    if not pattern:
+        return is_log_file
+    if regex:
+        search = re.compile(pattern).search
+        return lambda path: is_log_file(path) and search(path) is not None
+    return lambda path: is_log_file(path) and fnmatch.fnmatch(os.path.basename(path), pattern)
+
+
+def normal_termination(file_path, tail_bytes=TERMINATION_TAIL_BYTES):
+    """只读文件尾部判断最后一次结束是否为 Normal termination"""
+    if compression_of(file_path):
+        # 压缩文件须解压到末尾，解压后的尾部会被缓存，之后的提取不必再次解压
+        values = scan_log_tail(file_path, {"scf_termination": EXTRACTORS["scf_termination"]})
+        return values["scf_termination"] == 1.0
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - tail_bytes, 0))
+        tail = f.read()
+    normal, error = tail.rfind(b"Normal termination"), tail.rfind(b"Error termination")
+    return normal > error
+
+
+def classify_log(file_path):
+    """由路由部分判断文件类别：'gibbs'（含频率计算）、'scf'（单点计算）或 'other'"""
+    job = job_type(read_route(file_path)).split()
+    if "freq" in job:
+        return "gibbs"
+    return "scf" if job == ["sp"] else "other"
+
+
+def walk_logs(root, accept=is_log_file):
+    """用 os.scandir 非递归地遍历目录树，返回被 accept 接受的文件路径（按路径排序）"""
+    files = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file() and accept(entry.path):
+                            files.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    files.sort()
+    return files
+
+
+def _inspect(file_path, check_termination):
+    """检查并分类单个文件，返回类别；无法读取（含缺少解压模块的 .zst 文件）时为 'errors'"""
+    try:
+        if check_termination and not normal_termination(file_path):
+            return "incomplete"
+        return classify_log(file_path)
+    except (OSError, EOFError, ValueError, ImportError):
+        return "errors"
+
+
+def _discover_tree(root, accept, check_termination, cancelled):
+    """遍历一棵子树并检查其中的文件，返回 [(路径, 类别)]"""
+    found = []
+    for file_path in walk_logs(root, accept):
+        if cancelled is not None and cancelled():
+            break
+        found.append((file_path, _inspect(file_path, check_termination)))
+    return found
+
+
+def discover_logs(roots, pattern=None, regex=False, check_termination=True, workers=1, cancelled=None):
+    """在目录（或文件）中查找日志并分类
+
+    直接给出的文件与目录中找到的文件一样按 pattern 过滤。
+    返回 {类别: [绝对路径]}，类别见 DISCOVERY_KINDS；同一类别内按路径排序。
+    workers > 1 时各顶层子目录在线程池中并行遍历与检查。
+    """
+    accept = name_filter(pattern, regex)
+    files = []
+    subtrees = []
+    for root in roots:
+        root = os.path.abspath(root)
+        if os.path.isfile(root):
+            if accept(root):
+                files.append(root)
+            continue
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subtrees.append(entry.path)
+                    elif entry.is_file() and accept(entry.path):
+                        files.append(entry.path)
+        except OSError:
+            continue
+
+    found = [(file_path, _inspect(file_path, check_termination)) for file_path in files]
+    if workers > 1 and len(subtrees) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for tree in executor.map(lambda tree: _discover_tree(tree, accept, check_termination, cancelled),
+                                     subtrees):
+                found.extend(tree)
+    else:
+        for tree in subtrees:
+            found.extend(_discover_tree(tree, accept, check_termination, cancelled))
+
+    result = {kind: [] for kind in DISCOVERY_KINDS}
+    for file_path, kind in sorted(found):
+        result[kind].append(file_path)
+    return result
+
+
+def discovery_summary(result):
+    """导入结果的简短说明"""
+    labels = {"scf": "单点", "gibbs": "频率", "other": "其他作业", "incomplete": "未正常结束", "errors": "读取失败"}
+    return "，".join(f"{labels[kind]} {len(result[kind])} 个" for kind in DISCOVERY_KINDS if result[kind])
@@ -0,0 +1,397 @@
+"""结果导出：带格式的Excel报告以及 CSV / JSON / Parquet 数据文件
+
+第三方库（pandas、xlsxwriter、pyarrow）仅在对应格式导出时才导入。
+"""
+import csv
+import json
+import math
+import os
+from datetime import datetime
+
+from gaussian_core import (COLUMNS, EXTRACTORS, GROUP_COLUMN, NAME_COLUMN, RELATIVE_COLUMN, TOTAL_COLUMN,
+                           WEIGHT_COLUMN, WEIGHTED_PREFIX, column_descriptions)
+from gaussian_profiling import PROFILER
+
+EXPORT_FORMATS = ("xlsx", "csv", "json", "parquet")
+
+# 超过此行数时Excel报告使用 constant_memory 模式
+CONSTANT_MEMORY_ROWS = 20000
+# 超过此行数时不生成能量图表
+CHART_MAX_ROWS = 500
+# 超过此行数时建议改用 CSV/Parquet（不需要Excel格式）
+LARGE_EXPORT_ROWS = 200000
+# 导出 DataFrame 时每批转换为行字典的行数
+EXPORT_BATCH_ROWS = 10000
+
+
+def _cell(value):
+    """缺失值（None/NaN）统一为 None"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def export_format(output_file, fmt=None):
+    """根据显式格式或文件扩展名确定导出格式"""
+    fmt = (fmt or os.path.splitext(output_file)[1].lstrip('.')).lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式: {fmt}（可选: {', '.join(EXPORT_FORMATS)}）")
+    return fmt
+
+
+def row_columns(rows):
+    """结果行的列名（无数据时为默认列）"""
+    return list(rows[0]) if rows else list(COLUMNS)
+
+
+def export_rows(rows, output_file, fmt=None):
+    """将结果行（字典列表，键为结果列名）导出到文件"""
+    columns = row_columns(rows)
+    name_width = max(max((len(str(row[columns[0]])) for row in rows), default=0), 20)
+    with open_sink(output_file, columns, fmt, row_count=len(rows), name_width=name_width) as sink:
+        sink.write(rows)
+
+
+def export_frame(frame, output_file, fmt=None, batch_size=EXPORT_BATCH_ROWS):
+    """将 DataFrame（第一列为名称）分批转换为结果行导出，不一次性生成全部行字典"""
+    names = frame[frame.columns[0]].astype(str).str.len()
+    name_width = max(int(names.max()) if len(frame) else 0, 20)
+    with open_sink(output_file, list(frame.columns), fmt, row_count=len(frame), name_width=name_width) as sink:
+        for start in range(0, len(frame), batch_size):
+            sink.write(frame.iloc[start:start + batch_size].to_dict('records'))
+
+
+def open_sink(output_file, columns, fmt=None, row_count=None, name_width=20):
+    """打开逐批写入结果行的导出目标
+
+    row_count 为预计的行数（Excel报告据此选择是否使用 constant_memory 模式），未知时为 None，
+    此时 Excel 报告按行写出，内存占用与行数无关。
+    """
+    fmt = export_format(output_file, fmt)
+    if fmt == "xlsx":
+        constant_memory = row_count is None or row_count > CONSTANT_MEMORY_ROWS
+        return ExcelSink(output_file, columns, constant_memory, name_width)
+    return {"csv": CsvSink, "json": JsonSink, "parquet": ParquetSink}[fmt](output_file, columns)
+
+
+class RowSink:
+    """导出目标：write(rows) 可多次调用，每次写出一批结果行，close() 结束文件
+
+    写出与结束的耗时计入 export 阶段。
+    """
+
+    def __init__(self, output_file, columns):
+        self.output_file = output_file
+        self.columns = list(columns)
+        self.row_count = 0
+
+    def write(self, rows):
+        with PROFILER.stage("export"):
+            self._write(rows)
+        self.row_count += len(rows)
+        PROFILER.count("rows_exported", len(rows))
+
+    def close(self):
+        with PROFILER.stage("export"):
+            self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+
+class CsvSink(RowSink):
+    """CSV（UTF-8 BOM，便于Excel直接打开）"""
+
+    def __init__(self, output_file, columns):
+        super().__init__(output_file, columns)
+        self.file = open(output_file, 'w', newline='', encoding='utf-8-sig')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def _write(self, rows):
+        columns = self.columns
+        self.writer.writerows(["" if _cell(row[col]) is None else row[col] for col in columns] for row in rows)
+
+    def _close(self):
+        self.file.close()
+
+
+class JsonSink(RowSink):
+    """JSON记录列表，每行一条记录"""
+
+    def __init__(self, output_file, columns):
+        super().__init__(output_file, columns)
+        self.file = open(output_file, 'w', encoding='utf-8')
+        self.file.write("[")
+        self.separator = "\n"
+
+    def _write(self, rows):
+        for row in rows:
+            self.file.write(self.separator)
+            self.file.write(json.dumps({col: _cell(row[col]) for col in self.columns}, ensure_ascii=False))
+            self.separator = ",\n"
+
+    def _close(self):
+        self.file.write("\n]\n")
+        self.file.close()
+
+
+class ParquetSink(RowSink):
+    """Parquet（需要 pyarrow），每批写为一个 row group"""
+
+    def __init__(self, output_file, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        super().__init__(output_file, columns)
+        self.pa, self.pq = pa, pq
+        # 能量等数值列固定为 float64，其他列（如文件来源）由第一批数据推断类型
+        numeric = {e.label for e in EXTRACTORS.values()} | {TOTAL_COLUMN, RELATIVE_COLUMN, WEIGHT_COLUMN}
+        self.types = {col: pa.string() if col in (NAME_COLUMN, GROUP_COLUMN) else
+                      pa.float64() if col in numeric or col.startswith(WEIGHTED_PREFIX) else None
+                      for col in self.columns}
+        self.writer = None
+
+    def _table(self, rows):
+        return self.pa.table({col: self.pa.array([_cell(row[col]) for row in rows], type=self.types[col])
+                              for col in self.columns})
+
+    def _write(self, rows):
+        if not rows:
+            return
+        table = self._table(rows)
+        if self.writer is None:
+            self.types = {field.name: field.type for field in table.schema}
+            self.writer = self.pq.ParquetWriter(self.output_file, table.schema)
+        self.writer.write_table(table)
+
+    def _close(self):
+        if self.writer is None:
+            self.pq.write_table(self._table([]), self.output_file)
+        else:
+            self.writer.close()
+
+
+class ExcelSink(RowSink):
+    """带格式的Excel报告（数据表、说明页与图表）
+
+    constant_memory=True 时逐行写出，内存占用与行数无关；否则每批按列批量写出。
+    筛选、数据条、说明页与图表在 close() 时按最终行数添加。
+    """
+
+    def __init__(self, output_file, columns, constant_memory=True, name_width=20):
+        import xlsxwriter
+        super().__init__(output_file, columns)
+        column_names = self.columns
+        last_col = len(column_names) - 1
+
+        # 重命名列标题为更专业的名称
+        self.headers = ["分子名称"] + column_names[1:]
+
+        # 添加当前日期时间戳
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+        self.constant_memory = constant_memory
+        self.workbook = workbook = xlsxwriter.Workbook(output_file, {'constant_memory': constant_memory})
+        self.worksheet = worksheet = workbook.add_worksheet('能量分析')
+
+        # ================= 专业格式设置 =================
+        # 1. 标题格式
+        title_format = workbook.add_format({
+            'bold': True,
+            'font_size': 16,
+            'align': 'center',
+            'valign': 'vcenter'
+        })
+
+        # 2. 副标题格式
+        subtitle_format = workbook.add_format({
+            'italic': True,
+            'font_size': 10,
+            'align': 'center',
+            'valign': 'vcenter'
+        })
+
+        # 3. 表头格式
+        header_format = workbook.add_format({
+            'bold': True,
+            'border': 1,
+            'bg_color': '#4F81BD',  # 深蓝色
+            'color': 'white',
+            'align': 'center',
+            'valign': 'vcenter'
+        })
+
+        # 4. 数据单元格格式
+        data_format = workbook.add_format({
+            'border': 1,
+            'align': 'center',
+            'valign': 'vcenter',
+            'num_format': '0.00000000'  # 8位小数精度
+        })
+
+        # 计数/状态类列使用整数格式
+        integer_format = workbook.add_format({
+            'border': 1,
+            'align': 'center',
+            'valign': 'vcenter',
+            'num_format': '0'
+        })
+        integer_labels = {e.label for e in EXTRACTORS.values() if e.fmt == "{:.0f}"}
+        self.column_formats = [integer_format if col in integer_labels else data_format for col in column_names]
+
+        # 5. 空单元格格式
+        self.empty_format = workbook.add_format({
+            'border': 1,
+            'align': 'center',
+            'valign': 'vcenter',
+            'bg_color': '#F2F2F2'
+        })
+
+        # ================= 添加标题和元数据 =================
+        # 主标题
+        worksheet.merge_range(0, 0, 0, last_col, 'Gaussian 能量分析报告', title_format)
+
+        # 副标题
+        worksheet.merge_range(1, 0, 1, last_col, f'生成时间: {timestamp} | Gaussian版本: 09 Rev D.01',
+                              subtitle_format)
+
+        # ================= 设置列宽 =================
+        worksheet.set_column('A:A', name_width)
+        worksheet.set_column(1, last_col, 18)
+
+        # ================= 应用表头格式 =================
+        worksheet.write_row(3, 0, self.headers, header_format)
+
+        # 图表只在总能量列有值时生成
+        self.total_col = column_names.index(TOTAL_COLUMN) if TOTAL_COLUMN in column_names else None
+        self.has_total = False
+
+    def _write(self, rows):
+        worksheet, formats, empty_format = self.worksheet, self.column_formats, self.empty_format
+        first_row = self.row_count + 4
+        if self.constant_memory:
+            # constant_memory 模式只能按行顺序写入
+            for row_num, row in enumerate(rows, start=first_row):
+                for col_num, col in enumerate(self.columns):
+                    value = _cell(row[col])
+                    if value is None:
+                        worksheet.write_blank(row_num, col_num, None, empty_format)
+                    else:
+                        worksheet.write(row_num, col_num, value, formats[col_num])
+                        if col_num == self.total_col:
+                            self.has_total = True
+            return
+
+        # 整列批量写入，再用空单元格格式覆盖缺失值
+        for col_num, col in enumerate(self.columns):
+            values = [_cell(row[col]) for row in rows]
+            worksheet.write_column(first_row, col_num, values, formats[col_num])
+            for row_num, value in enumerate(values, start=first_row):
+                if value is None:
+                    worksheet.write_blank(row_num, col_num, None, empty_format)
+            if col_num == self.total_col and any(value is not None for value in values):
+                self.has_total = True
+
+    def _close(self):
+        workbook, worksheet, headers = self.workbook, self.worksheet, self.headers
+        row_count = self.row_count
+
+        # ================= 添加自动筛选 =================
+        worksheet.autofilter(3, 0, row_count + 3, len(headers) - 1)
+
+        # ================= 添加条件格式 =================
+        # 对能量列添加数据条以直观显示数值大小
+        for col in range(1, len(headers)):
+            worksheet.conditional_format(
+                4, col, row_count + 3, col,
+                {
+                    'type': 'data_bar',
+                    'bar_color': '#5B9BD5',  # 蓝色数据条
+                    'bar_border_color': '#5B9BD5'
+                }
+            )
+
+        # ================= 添加注释工作表 =================
+        notes_sheet = workbook.add_worksheet('分析说明')
+
+        # 注释内容
+        notes = [
+            ("Gaussian 能量分析报告", "标题格式"),
+            ("", ""),
+            ("本报告包含以下列：", "小标题"),
+        ] + [
+            (f"  {header} - {description}", "正常文本")
+            for header, description in zip(headers, column_descriptions(self.columns).values())
+        ] + [
+            ("", ""),
+            ("数据处理说明：", "小标题"),
+            ("  - 缺失值显示为灰色单元格", "正常文本"),
+            ("  - 所有能量值保留8位小数精度", "正常文本"),
+            ("  - 数据条可视化能量值相对大小", "正常文本"),
+            ("", ""),
+            ("使用建议：", "小标题"),
+            ("  1. 使用自动筛选功能可快速过滤数据", "正常文本"),
+            ("  2. 数据条可直观比较能量值大小", "正常文本"),
+            ("  3. 排序功能可按任意列排序", "正常文本")
+        ]
+
+        # 注释格式
+        title_note = workbook.add_format({'bold': True, 'font_size': 14})
+        subtitle_note = workbook.add_format({'bold': True, 'font_size': 12})
+        normal_note = workbook.add_format({'text_wrap': True})
+
+        # 写入注释
+        row = 0
+        for note, note_type in notes:
+            if note_type == "标题格式":
+                notes_sheet.write(row, 0, note, title_note)
+                row += 2
+            elif note_type == "小标题":
+                notes_sheet.write(row, 0, note, subtitle_note)
+                row += 1
+            else:
+                notes_sheet.write(row, 0, note, normal_note)
+                row += 1
+
+        # 设置注释列宽
+        notes_sheet.set_column('A:A', 60)
+
+        # ================= 添加图表分析 =================
+        # 行数过多时柱状图失去可读性，跳过图表
+        total_col = self.total_col
+        if total_col is not None and 1 < row_count <= CHART_MAX_ROWS and self.has_total:
+            # 创建图表工作表
+            chart_sheet = workbook.add_worksheet('能量图表')
+
+            # 创建柱状图
+            chart = workbook.add_chart({'type': 'column'})
+
+            # 配置图表数据
+            chart.add_series({
+                'name': ['能量分析', 3, total_col],
+                'categories': ['能量分析', 4, 0, row_count + 3, 0],
+                'values': ['能量分析', 4, total_col, row_count + 3, total_col],
+                'data_labels': {'value': True, 'num_format': '0.0000'},
+                'fill': {'color': '#4472C4'}
+            })
+
+            # 设置图表标题和样式
+            chart.set_title({'name': '分子总能量比较'})
+            chart.set_x_axis({'name': '分子名称', 'text_rotation': -45})
+            chart.set_y_axis({'name': '总能量 (a.u.)'})
+            chart.set_legend({'none': True})
+            chart.set_style(11)  # 使用预定义样式
+
+            # 在工作表中插入图表
+            chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
+
+        workbook.close()
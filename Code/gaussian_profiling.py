@@ -0,0 +1,201 @@
+"""性能统计：各阶段耗时、计数器，可导出为 JSON、Chrome trace 或 cProfile 文件
+
+默认关闭；关闭时 stage() 返回共享的空上下文、count() 直接返回，开销可忽略。
+进程池中的工作进程各自记录，由 take()/merge() 汇总到主进程。
+
+    with PROFILER.stage("parsing"):
+        ...
+    PROFILER.count("cache_hits", n)
+
+    @PROFILER.timed("matching")
+    def match_files(...):
+"""
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+
+# 各阶段在界面与报告中的名称
+STAGE_LABELS = {
+    "matching": "文件匹配",
+    "cache_lookup": "缓存查询",
+    "cache_store": "缓存写入",
+    "reading": "读取",
+    "parsing": "解析",
+    "table_build": "表格构建",
+    "render": "表格渲染",
+    "analysis": "Boltzmann分析",
+    "export": "导出",
+    "store_append": "写入结果库",
+    "store_load": "载入结果库",
+}
+
+COUNTER_LABELS = {
+    "files": "文件数",
+    "deduplicated": "去重文件数",
+    "bytes_scanned": "扫描字节数",
+    "bytes_decompressed": "解压字节数",
+    "matches": "匹配到的数值",
+    "cache_hits": "缓存命中",
+    "cache_misses": "缓存未命中",
+    "errors": "读取错误",
+    "rows_rendered": "渲染行数",
+    "rows_exported": "导出行数",
+}
+
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+
+
+class Profiler:
+    """记录阶段耗时与计数器（线程安全）"""
+
+    # Chrome trace 中保留的事件数上限，超出后只累计耗时
+    MAX_EVENTS = 200000
+
+    def __init__(self):
+        self.enabled = False
+        self.cprofile = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self, cprofile=False):
+        """开启统计；cprofile=True 时同时对后台任务做函数级剖析"""
+        self.enabled = True
+        if not cprofile:
+            self.cprofile = None
+        elif self.cprofile is None:
+            self.cprofile = cProfile.Profile()
+
+    def disable(self):
+        self.enabled = False
+        self.cprofile = None
+
+    def reset(self):
+        with self._lock:
+            self.timings = {}  # 阶段 -> [次数, 总耗时ns, 最长ns]
+            self.counters = {}
+            self.events = []  # (阶段, 开始ns, 持续ns, 进程, 线程)
+            self.dropped_events = 0
+        if self.cprofile is not None:
+            self.cprofile = cProfile.Profile()
+
+    def stage(self, name):
+        """计时上下文；未开启时返回空上下文"""
+        return _Stage(self, name) if self.enabled else _NULL_STAGE
+
+    def timed(self, name):
+        """装饰器：把函数的每次调用计入阶段 name"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Stage(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def profiled(self):
+        """cProfile 剖析上下文（仅在开启 cprofile 时生效）"""
+        return self.cprofile if self.enabled and self.cprofile is not None else _NULL_STAGE
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record(self, name, start_ns, end_ns):
+        duration = end_ns - start_ns
+        with self._lock:
+            timing = self.timings.setdefault(name, [0, 0, 0])
+            timing[0] += 1
+            timing[1] += duration
+            timing[2] = max(timing[2], duration)
+            if len(self.events) < self.MAX_EVENTS:
+                self.events.append((name, start_ns, duration, os.getpid(), threading.get_ident()))
+            else:
+                self.dropped_events += 1
+
+    def take(self):
+        """取出并清空当前记录（工作进程返回给主进程）"""
+        with self._lock:
+            data = {"timings": self.timings, "counters": self.counters,
+                    "events": self.events, "dropped_events": self.dropped_events}
+            self.timings, self.counters, self.events, self.dropped_events = {}, {}, [], 0
+        return data
+
+    def merge(self, data):
+        """合并工作进程 take() 的结果"""
+        with self._lock:
+            for name, (calls, total, longest) in data["timings"].items():
+                timing = self.timings.setdefault(name, [0, 0, 0])
+                timing[0] += calls
+                timing[1] += total
+                timing[2] = max(timing[2], longest)
+            for name, n in data["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            room = self.MAX_EVENTS - len(self.events)
+            self.events.extend(data["events"][:max(room, 0)])
+            self.dropped_events += data["dropped_events"] + max(len(data["events"]) - max(room, 0), 0)
+
+    def summary(self):
+        """可写为JSON的统计结果（秒）"""
+        with self._lock:
+            timings = {name: {"calls": calls, "seconds": total / 1e9, "max_seconds": longest / 1e9}
+                       for name, (calls, total, longest) in self.timings.items()}
+            return {"timings": timings, "counters": dict(self.counters), "dropped_events": self.dropped_events}
+
+    def report_lines(self):
+        """用于界面与命令行显示的文字报告"""
+        summary = self.summary()
+        lines = [f"{'阶段':<10}{'次数':>8}{'总耗时(秒)':>14}{'最长(秒)':>12}"]
+        for name, timing in sorted(summary["timings"].items(), key=lambda item: -item[1]["seconds"]):
+            lines.append(f"{STAGE_LABELS.get(name, name):<10}{timing['calls']:>8}"
+                         f"{timing['seconds']:>14.4f}{timing['max_seconds']:>12.4f}")
+        if summary["counters"]:
+            lines.append("")
+            for name, value in sorted(summary["counters"].items()):
+                lines.append(f"{COUNTER_LABELS.get(name, name):<12}{value:>16,}")
+        return lines
+
+    def dump_json(self, output_file):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+    def dump_chrome_trace(self, output_file):
+        """写出 Chrome trace（chrome://tracing 或 Perfetto 中打开）"""
+        with self._lock:
+            events = [{"name": STAGE_LABELS.get(name, name), "cat": name, "ph": "X",
+                       "ts": start / 1000, "dur": duration / 1000, "pid": pid, "tid": tid}
+                      for name, start, duration, pid, tid in self.events]
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+    def dump_cprofile(self, output_file):
+        """写出 cProfile 统计（可用 pstats 或 snakeviz 查看）"""
+        if self.cprofile is None:
+            raise ValueError("未开启 cProfile 剖析")
+        self.cprofile.dump_stats(output_file)
+
+
+# 全局统计对象
+PROFILER = Profiler()
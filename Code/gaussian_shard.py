@@ -0,0 +1,143 @@
+"""分片提取：把匹配好的 SCF/Gibbs 文件对按清单分成 N 片，各节点独立提取，最后合并
+
+    manifest = plan_shards(scf_files, gibbs_files, 4, quantities)
+    write_manifest(manifest, "campaign.manifest.json")
+    # 每个节点: gaussian_cli.py shard run campaign.manifest.json --shard K
+    scf_files, gibbs_files, file_values, errors = merge_partials(manifest, load_partials(...))
+
+第 i 对文件属于第 i % N 片。清单记录完整的文件对顺序与提取设置，合并后的表格与
+在单机上用同样的文件对提取的结果完全相同。各片的结果先写到临时文件再改名，
+合并时不会读到写了一半的文件。
+"""
+import hashlib
+import json
+import os
+import time
+
+from gaussian_core import DEFAULT_QUANTITIES, EXTRACTORS, collect_file_patterns, extract_files
+
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def manifest_id(pairs, quantities, link1):
+    """由文件对、物理量与提取方式计算的清单标识，各片结果据此确认来自同一清单"""
+    payload = json.dumps([pairs, list(quantities), bool(link1)], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def plan_shards(scf_files, gibbs_files, shards, quantities=DEFAULT_QUANTITIES, link1=False):
+    """按文件对顺序生成分片清单（第 i 对属于第 i % shards 片）"""
+    if shards < 1:
+        raise ValueError(f"分片数必须至少为1: {shards}")
+    pairs = [[scf_file, gibbs_files[i] if i < len(gibbs_files) else None] for i, scf_file in enumerate(scf_files)]
+    quantities = list(quantities)
+    return {
+        "version": MANIFEST_VERSION,
+        "id": manifest_id(pairs, quantities, link1),
+        "created": time.time(),
+        "shards": shards,
+        "quantities": quantities,
+        "link1": bool(link1),
+        "pairs": pairs,
+    }
+
+
+def _write_json(data, output_file):
+    """先写临时文件再改名，其他进程不会读到写了一半的文件"""
+    temp_file = f"{output_file}.{os.getpid()}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temp_file, output_file)
+
+
+def write_manifest(manifest, output_file):
+    _write_json(manifest, output_file)
+
+
+def load_manifest(manifest_file):
+    """读取分片清单，版本不符或物理量未知时抛出 ValueError"""
+    with open(manifest_file, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"不支持的分片清单版本: {manifest.get('version')}")
+    unknown = [name for name in manifest["quantities"] if name not in EXTRACTORS]
+    if unknown:
+        raise ValueError(f"未知的物理量: {', '.join(unknown)}")
+    return manifest
+
+
+def shard_rows(manifest, shard):
+    """第 shard 片包含的文件对序号"""
+    if not 0 <= shard < manifest["shards"]:
+        raise ValueError(f"分片编号应在 0-{manifest['shards'] - 1} 之间: {shard}")
+    return list(range(shard, len(manifest["pairs"]), manifest["shards"]))
+
+
+def partial_path(manifest_file, shard, shards):
+    """第 shard 片结果的默认路径（清单旁）"""
+    stem = manifest_file[:-len(MANIFEST_SUFFIX)] if manifest_file.endswith(MANIFEST_SUFFIX) else \
+        os.path.splitext(manifest_file)[0]
+    return f"{stem}.shard{shard:04d}-of-{shards:04d}.json"
+
+
+def run_shard(manifest, shard, workers=1, chunk_size=64, cache=None, progress=None, cancelled=None):
+    """提取第 shard 片，返回可写为 JSON 的部分结果；被取消时返回 None"""
+    rows = shard_rows(manifest, shard)
+    scf_files = [manifest["pairs"][i][0] for i in rows]
+    gibbs_files = [manifest["pairs"][i][1] for i in rows]
+    file_patterns = collect_file_patterns(scf_files, gibbs_files, manifest["quantities"], manifest["link1"])
+    file_values, errors = extract_files(file_patterns, workers, chunk_size, cache, progress, cancelled)
+    if file_values is None:
+        return None
+    return {
+        "version": MANIFEST_VERSION,
+        "manifest_id": manifest["id"],
+        "shard": shard,
+        "rows": rows,
+        "file_values": file_values,
+        "errors": {file_path: list(error) for file_path, error in errors.items()},
+    }
+
+
+def write_partial(partial, output_file):
+    _write_json(partial, output_file)
+
+
+def load_partials(manifest_file, manifest, partial_files=None):
+    """读取各片结果；partial_files 为空时读取清单旁默认路径中存在的文件"""
+    if not partial_files:
+        partial_files = [partial_path(manifest_file, shard, manifest["shards"]) for shard in range(manifest["shards"])]
+        partial_files = [f for f in partial_files if os.path.exists(f)]
+    partials = []
+    for partial_file in partial_files:
+        with open(partial_file, encoding='utf-8') as f:
+            partials.append(json.load(f))
+    return partials
+
+
+def merge_partials(manifest, partials):
+    """合并各片结果，返回 (scf_files, gibbs_files, file_values, errors)，与单机提取的结果形式相同
+
+    缺少分片、分片重复或来自其他清单时抛出 ValueError。
+    """
+    seen = {}
+    for partial in partials:
+        if partial.get("manifest_id") != manifest["id"]:
+            raise ValueError(f"分片 {partial.get('shard')} 的结果不属于此清单")
+        if partial["shard"] in seen:
+            raise ValueError(f"分片 {partial['shard']} 的结果重复")
+        seen[partial["shard"]] = partial
+    missing = [shard for shard in range(manifest["shards"]) if shard not in seen]
+    if missing:
+        raise ValueError(f"缺少 {len(missing)} 个分片的结果: {', '.join(map(str, missing[:20]))}")
+
+    file_values = {}
+    errors = {}
+    for partial in seen.values():
+        file_values.update(partial["file_values"])
+        errors.update((file_path, tuple(error)) for file_path, error in partial["errors"].items())
+    scf_files = [scf_file for scf_file, _ in manifest["pairs"]]
+    gibbs_files = [gibbs_file for _, gibbs_file in manifest["pairs"]]
+    return scf_files, gibbs_files, file_values, errors
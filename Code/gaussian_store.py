@@ -0,0 +1,167 @@
+"""项目结果库：每次提取的结果及其来源追加保存到 SQLite，启动时无需原始日志即可重新载入
+
+每次提取为一个 run，按列保存：分子名称、SCF/Gibbs 文件的路径、大小、修改时间与作业类型，
+以及每个物理量一列（q_名称）。已有记录不会被修改或删除。
+"""
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from array import array
+
+from gaussian_core import DEFAULT_CACHE_PATH, EXTRACTORS, JOB_KEY, build_columns, columns_to_rows
+from gaussian_export import export_rows
+from gaussian_profiling import PROFILER
+
+
+DEFAULT_PROJECT_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "results.sqlite3")
+NAN = float("nan")
+PROVENANCE_COLUMNS = ("scf_path", "scf_size", "scf_mtime_ns", "scf_job",
+                      "gibbs_path", "gibbs_size", "gibbs_mtime_ns", "gibbs_job")
+
+
+def file_provenance(file_path, job=None):
+    """文件的 (路径, 大小, 修改时间ns, 作业类型)，文件不可读时只保留路径
+
+    作业类型由提取时记录（提取结果的 JOB_KEY），这里不再读取日志内容。
+    """
+    if not file_path:
+        return None, None, None, None
+    try:
+        st = os.stat(file_path)
+        return file_path, st.st_size, st.st_mtime_ns, job
+    except OSError:
+        return file_path, None, None, None
+
+
+class ResultStore:
+    """只追加的项目结果库
+
+    每个 run 的每一列单独存为一个二进制块：数值列为 float64 数组（缺失值为NaN），
+    文本与整数列为压缩的JSON列表。载入时只读取需要的列，20万行也只需几十毫秒。
+    """
+
+    def __init__(self, db_path=DEFAULT_PROJECT_PATH):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # 在后台任务线程中读写，调用方保证同一时间只有一个线程访问
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS runs (
+                                 id INTEGER PRIMARY KEY,
+                                 created REAL,
+                                 quantities TEXT,
+                                 row_count INTEGER)""")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS run_columns (
+                                 run_id INTEGER,
+                                 name TEXT,
+                                 encoding TEXT,
+                                 data BLOB,
+                                 PRIMARY KEY (run_id, name))""")
+        self.conn.commit()
+
+    @staticmethod
+    def encode_column(values, numeric=False):
+        if numeric:
+            column = array("d", (NAN if v is None else v for v in values))
+            if sys.byteorder != "little":
+                column.byteswap()
+            return "f8", column.tobytes()
+        return "json", zlib.compress(json.dumps(list(values)).encode("utf-8"), 1)
+
+    @staticmethod
+    def decode_column(encoding, data):
+        if encoding == "f8":
+            column = array("d")
+            column.frombytes(data)
+            if sys.byteorder != "little":
+                column.byteswap()
+            return [None if v != v else v for v in column]
+        return json.loads(zlib.decompress(data))
+
+    @PROFILER.timed("store_append")
+    def append_run(self, scf_files, gibbs_files, file_values, quantities):
+        """把一次提取的结果（extract_files 的结果，作业类型取自其中的 JOB_KEY）追加为新的 run，返回 run 编号"""
+        quantities = list(quantities)
+        names, values = build_columns(scf_files, gibbs_files, file_values, quantities)
+        gibbs_files = [gibbs_files[i] if i < len(gibbs_files) else None for i in range(len(scf_files))]
+
+        provenance = {None: file_provenance(None)}
+        for file_path in set(scf_files) | set(gibbs_files):
+            provenance[file_path] = file_provenance(file_path, file_values.get(file_path, {}).get(JOB_KEY))
+
+        columns = {"molecule": names}
+        for role, files in (("scf", scf_files), ("gibbs", gibbs_files)):
+            info = list(zip(*(provenance[f] for f in files))) or [()] * 4
+            for field, column in zip(("path", "size", "mtime_ns", "job"), info):
+                columns[f"{role}_{field}"] = column
+
+        with self.conn:
+            run_id = self.conn.execute("INSERT INTO runs (created, quantities, row_count) VALUES (?, ?, ?)",
+                                       (time.time(), json.dumps(quantities), len(names))).lastrowid
+            entries = [(run_id, name) + self.encode_column(column) for name, column in columns.items()]
+            entries += [(run_id, f"q_{name}") + self.encode_column(values[name], numeric=True)
+                        for name in quantities]
+            self.conn.executemany("INSERT INTO run_columns VALUES (?, ?, ?, ?)", entries)
+        return run_id
+
+    def runs(self):
+        """全部 run，最新的在前：[{id, created, quantities, row_count}]"""
+        return [{"id": run_id, "created": created, "quantities": json.loads(quantities), "row_count": row_count}
+                for run_id, created, quantities, row_count in
+                self.conn.execute("SELECT id, created, quantities, row_count FROM runs ORDER BY id DESC")]
+
+    def latest_run_id(self):
+        row = self.conn.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+    @PROFILER.timed("store_load")
+    def load_run(self, run_id=None, provenance=True):
+        """载入一个 run（默认最新），返回 (run 信息, 列数据) 或 (None, None)
+
+        列数据为 {"molecule": [...], "scf_path": [...], ..., "values": {物理量: [...]}}；
+        provenance=False 时来源信息只载入文件路径。
+        """
+        run_id = self.latest_run_id() if run_id is None else run_id
+        if run_id is None:
+            return None, None
+        row = self.conn.execute("SELECT id, created, quantities, row_count FROM runs WHERE id = ?",
+                                (run_id,)).fetchone()
+        if row is None:
+            return None, None
+        run = {"id": row[0], "created": row[1], "quantities": json.loads(row[2]), "row_count": row[3]}
+
+        names = ["molecule"] + [c for c in PROVENANCE_COLUMNS if provenance or c.endswith("_path")]
+        names += [f"q_{name}" for name in run["quantities"]]
+        columns = {name: self.decode_column(encoding, blob) for name, encoding, blob in self.conn.execute(
+            f"SELECT name, encoding, data FROM run_columns WHERE run_id = ? AND name IN ({','.join('?' * len(names))})",
+            [run_id] + names)}
+        empty = [None] * run["row_count"]
+        data = {name: columns.get(name, empty) for name in names if not name.startswith("q_")}
+        data["values"] = {name: columns.get(f"q_{name}", empty) for name in run["quantities"]}
+        return run, data
+
+    def export_run(self, output_file, run_id=None, fmt=None, provenance=True):
+        """把一个 run 导出为 xlsx/csv/json/parquet；provenance=True 时附带文件来源列"""
+        run, data = self.load_run(run_id, provenance)
+        if run is None:
+            raise ValueError("结果库中没有数据")
+        quantities = [name for name in run["quantities"] if name in EXTRACTORS]
+        rows = columns_to_rows(data["molecule"], data["values"], quantities)
+        if provenance:
+            for i, row in enumerate(rows):
+                row.update((column, data[column][i]) for column in PROVENANCE_COLUMNS)
+        export_rows(rows, output_file, fmt)
+        return len(rows)
+
+    def close(self):
+        self.conn.close()
+
+
+def describe_run(run):
+    """run 的简短说明"""
+    labels = "、".join(EXTRACTORS[name].label if name in EXTRACTORS else name for name in run["quantities"])
+    created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["created"]))
+    return f"#{run['id']}  {created}  {run['row_count']} 行  {labels}"
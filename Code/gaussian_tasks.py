@@ -0,0 +1,150 @@
+"""后台任务调度：耗时操作在工作线程中执行，结果通过 root.after 回到界面线程
+
+工作线程中不得访问任何 Tk 控件；进度只记录最近一次的快照，
+由界面线程定时读取并合并显示，避免大量进度事件挤占事件循环。
+"""
+import queue
+import threading
+import time
+
+from gaussian_profiling import PROFILER
+
+
+class TaskCancelled(Exception):
+    """任务被用户取消"""
+
+
+def format_duration(seconds):
+    """把秒数格式化为 1:02:03 / 2:03 形式"""
+    seconds = int(seconds + 0.5)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class Task:
+    """一个后台任务：work(task) 在工作线程执行，回调在界面线程执行"""
+
+    def __init__(self, name, work, on_done=None, on_error=None, on_cancel=None):
+        self.name = name
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.started = None
+        self._cancel_event = threading.Event()
+        self._progress = None
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def check(self):
+        """在工作线程中调用，已请求取消时抛出 TaskCancelled"""
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def report(self, done, total, bytes_done=0):
+        """记录进度（工作线程调用，只保留最近一次）"""
+        self._progress = (done, total, bytes_done)
+
+    def progress_text(self):
+        """当前进度的文字说明：完成数、文件/秒、字节/秒和预计剩余时间"""
+        if self.cancelled:
+            return f"正在取消{self.name}..."
+        if self.started is None or self._progress is None:
+            return f"正在{self.name}..."
+        done, total, bytes_done = self._progress
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        rate = done / elapsed
+        text = f"正在{self.name}... {done}/{total} 个文件，{rate:.0f} 文件/秒"
+        if bytes_done:
+            text += f"，{bytes_done / elapsed / 1e6:.1f} MB/秒"
+        if 0 < done < total:
+            text += f"，剩余约 {format_duration((total - done) / rate)}"
+        return text
+
+
+class TaskRunner:
+    """单个工作线程按提交顺序执行任务，界面线程每 POLL_MS 毫秒处理完成的任务并刷新进度"""
+
+    POLL_MS = 100
+
+    def __init__(self, root, on_status):
+        self.root = root
+        self.on_status = on_status
+        self.active = []
+        self._jobs = queue.Queue()
+        self._finished = queue.Queue()
+        self._thread = None
+        self._poll_job = None
+
+    @property
+    def busy(self):
+        return bool(self.active)
+
+    def submit(self, name, work, on_done=None, on_error=None, on_cancel=None):
+        """提交任务并返回 Task；回调分别接收结果、异常和无参数"""
+        task = Task(name, work, on_done, on_error, on_cancel)
+        self.active.append(task)
+        self._jobs.put(task)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="gaussian-tasks", daemon=True)
+            self._thread.start()
+        if self._poll_job is None:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
+        self.on_status(task.progress_text())
+        return task
+
+    def cancel(self):
+        """取消所有未完成的任务"""
+        for task in self.active:
+            task.cancel()
+        if self.active:
+            self.on_status(self.active[0].progress_text())
+
+    def _run(self):
+        while True:
+            task = self._jobs.get()
+            if task.cancelled:
+                self._finished.put((task, "cancelled", None))
+                continue
+            task.started = time.perf_counter()
+            try:
+                with PROFILER.profiled():
+                    result = task.work(task)
+                self._finished.put((task, "done", result))
+            except TaskCancelled:
+                self._finished.put((task, "cancelled", None))
+            except Exception as e:
+                self._finished.put((task, "error", e))
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                task, state, value = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            self.active.remove(task)
+            if state == "done":
+                if task.on_done:
+                    task.on_done(value)
+            elif state == "cancelled":
+                if task.on_cancel:
+                    task.on_cancel()
+                else:
+                    self.on_status(f"{task.name}已取消")
+            elif task.on_error:
+                task.on_error(value)
+            else:
+                self.on_status(f"{task.name}失败: {value}")
+
+        # 每个轮询周期只显示正在执行的任务的最新进度
+        if self.active:
+            self.on_status(self.active[0].progress_text())
+        if self.active and self._poll_job is None:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
@@ -0,0 +1,283 @@
+"""优化轨迹：逐步提取 SCF 能量、力与位移收敛值以及笛卡尔坐标，保存为 NumPy 数组
+
+每个量为一个连续的 float64 数组，按需倍增容量追加，不构造逐步的字典列表。
+整个项目的轨迹按量拼接为一组数组，并用偏移数组区分各文件：
+
+    data = extract_trajectories(files, workers=8)
+    save_trajectories(data, "traj.npz")              # 或目录（每个数组一个 .npy，可内存映射载入）
+    data = load_trajectories("traj.npz")
+    energy = file_trajectory(data, 0)["energy"]
+
+保存的数组可以不重新解析日志直接做向量化分析，例如用 final_values() 找出未收敛的优化。
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gaussian_core import (LINK1_MARKER, compression_of, log_index, open_decompressed, open_mapped,
+                           select_step)
+from gaussian_profiling import PROFILER
+
+
+# 每个优化步骤的标量：数组名 -> 日志中所在行的开头
+STEP_QUANTITIES = {
+    "energy": b"SCF Done:",
+    "max_force": b" Maximum Force ",
+    "rms_force": b" RMS     Force ",
+    "max_displacement": b" Maximum Displacement ",
+    "rms_displacement": b" RMS     Displacement ",
+}
+# 优先使用标准取向；nosymm 等作业只有输入取向
+ORIENTATION_MARKERS = (b"Standard orientation:", b"Input orientation:")
+GEOMETRY_END = b" ---------"
+GEOMETRY_HEADER_LINES = 5
+
+TRAJECTORY_FORMATS = ("npz", "npy")
+
+
+class GrowableArray:
+    """按需倍增容量的 float64 数组，追加的均摊开销为 O(1)"""
+
+    def __init__(self, row_shape=(), capacity=64):
+        self.data = np.empty((capacity,) + tuple(row_shape), dtype=np.float64)
+        self.size = 0
+
+    def _reserve(self, needed):
+        if needed <= len(self.data):
+            return
+        grown = np.empty((max(needed, 2 * len(self.data)),) + self.data.shape[1:], dtype=np.float64)
+        grown[:self.size] = self.data[:self.size]
+        self.data = grown
+
+    def append(self, value):
+        self._reserve(self.size + 1)
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self._reserve(self.size + len(values))
+        self.data[self.size:self.size + len(values)] = values
+        self.size += len(values)
+
+    @property
+    def array(self):
+        """已填充部分（视图，不复制）"""
+        return self.data[:self.size]
+
+
+def _step_value(data, start, end, marker):
+    """marker 所在行中 marker 之后的第一个数值（SCF Done 行取等号后的数值），无法解析时为 NaN"""
+    line_end = data.find(b"\n", start, end)
+    line = data[start:end if line_end < 0 else line_end]
+    if marker == b"SCF Done:":
+        line = line.partition(b"=")[2]
+    else:
+        line = line[len(marker):]
+    try:
+        return float(line.split()[0])
+    except (IndexError, ValueError):
+        # 数值溢出时 Gaussian 输出 ********
+        return np.nan
+
+
+def _geometry_block(data, start, end):
+    """取向表（从标题行开始）的 (原子序数, 坐标 n×3)，格式不完整时返回 None"""
+    pos = start
+    for _ in range(GEOMETRY_HEADER_LINES):
+        pos = data.find(b"\n", pos, end) + 1
+        if pos <= 0:
+            return None
+    stop = data.find(GEOMETRY_END, pos, end)
+    if stop < 0:
+        return None
+    rows = bytes(data[pos:stop]).split(b"\n")
+    rows = [row for row in rows if row.strip()]
+    if not rows:
+        return None
+    # 新版本每行为 序号 原子序数 原子类型 x y z，旧版本没有原子类型列
+    width = len(rows[0].split())
+    try:
+        table = np.array(b" ".join(rows).split(), dtype=np.float64).reshape(len(rows), width)
+    except ValueError:
+        return None
+    return table[:, 1], table[:, -3:]
+
+
+@PROFILER.timed("parsing")
+def scan_trajectory(data, start=0, end=None):
+    """在 data[start:end] 中逐步提取轨迹，返回 {数组名: ndarray}
+
+    energy 等为每个步骤一个值（各自按出现次数计数），geometry 为 (步数, 原子数, 3)，
+    atomic_numbers 为第一帧的原子序数；原子数与第一帧不同的帧被跳过。
+    """
+    end = len(data) if end is None else end
+    values = {}
+    for name, marker in STEP_QUANTITIES.items():
+        column = GrowableArray()
+        pos = data.find(marker, start, end)
+        while pos >= 0:
+            column.append(_step_value(data, pos, end, marker))
+            pos = data.find(marker, pos + len(marker), end)
+        values[name] = column.array
+
+    coordinates = GrowableArray((3,))
+    atomic_numbers = None
+    frames = 0
+    for marker in ORIENTATION_MARKERS:
+        pos = data.find(marker, start, end)
+        while pos >= 0:
+            block = _geometry_block(data, pos, end)
+            if block is not None and (atomic_numbers is None or len(block[0]) == len(atomic_numbers)):
+                atomic_numbers = block[0] if atomic_numbers is None else atomic_numbers
+                coordinates.extend(block[1])
+                frames += 1
+            pos = data.find(marker, pos + len(marker), end)
+        if frames:
+            break
+    atoms = 0 if atomic_numbers is None else len(atomic_numbers)
+    values["geometry"] = coordinates.array.reshape(frames, atoms, 3)
+    values["atomic_numbers"] = np.empty(0) if atomic_numbers is None else atomic_numbers
+    return values
+
+
+def extract_trajectory(file_path, step="opt"):
+    """提取一个日志的优化轨迹
+
+    step 为作业关键词时只扫描 Link1 分步索引中最后一个含该关键词的步骤（没有时为最后一步），
+    为 None 时扫描全文。压缩文件整体解压后扫描全文。
+    """
+    if compression_of(file_path):
+        with open_decompressed(file_path) as f:
+            data = f.read()
+        PROFILER.count("bytes_decompressed", len(data))
+        return scan_trajectory(data)
+    with open_mapped(file_path) as data:
+        start, end = 0, len(data)
+        if step is not None and data.find(LINK1_MARKER) >= 0:
+            selected = select_step(log_index(file_path), step)
+            start, end = selected["start"], selected["end"]
+        PROFILER.count("bytes_scanned", end - start)
+        return scan_trajectory(data, start, end)
+
+
+def _trajectory_worker(task):
+    file_path, step = task
+    try:
+        return extract_trajectory(file_path, step), None
+    except (OSError, EOFError, ValueError) as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def extract_trajectories(files, step="opt", workers=1, progress=None):
+    """提取多个日志的轨迹并按量拼接
+
+    返回 {"files", 各量数组, 各量的 "<名称>_offsets", "geometry", "geometry_offsets",
+    "coordinate_offsets", "atom_offsets", "atomic_numbers", "errors"}：第 i 个文件的 energy 为
+    energy[energy_offsets[i]:energy_offsets[i + 1]]；geometry 为各帧坐标按行拼接的 (总行数, 3)，
+    geometry_offsets 以帧、coordinate_offsets 以行为单位，见 file_trajectory()。
+    读取失败的文件轨迹为空，错误信息记录在 errors（无错误时为空字符串）。
+    """
+    files = list(files)
+    columns = {name: GrowableArray() for name in STEP_QUANTITIES}
+    offsets = {name: np.zeros(len(files) + 1, dtype=np.int64) for name in list(STEP_QUANTITIES) + ["geometry"]}
+    atom_offsets = np.zeros(len(files) + 1, dtype=np.int64)
+    coordinate_offsets = np.zeros(len(files) + 1, dtype=np.int64)
+    coordinates = GrowableArray((3,))
+    atomic_numbers = GrowableArray()
+    errors = []
+
+    tasks = [(file_path, step) for file_path in files]
+    if workers > 1 and len(files) > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_trajectory_worker, tasks, chunksize=max(1, len(files) // (workers * 4)))
+    else:
+        executor = None
+        results = map(_trajectory_worker, tasks)
+    try:
+        for i, (values, error) in enumerate(results):
+            errors.append(error or "")
+            if values is not None:
+                for name, column in columns.items():
+                    column.extend(values[name])
+                coordinates.extend(values["geometry"].reshape(-1, 3))
+                atomic_numbers.extend(values["atomic_numbers"])
+                frames = len(values["geometry"])
+            else:
+                frames = 0
+            for name, column in columns.items():
+                offsets[name][i + 1] = column.size
+            offsets["geometry"][i + 1] = offsets["geometry"][i] + frames
+            atom_offsets[i + 1] = atomic_numbers.size
+            coordinate_offsets[i + 1] = coordinates.size
+            if progress is not None:
+                progress(i + 1, len(files))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    data = {"files": np.array([os.path.abspath(f) for f in files], dtype=str),
+            "errors": np.array(errors, dtype=str)}
+    for name, column in columns.items():
+        data[name] = column.array
+        data[name + "_offsets"] = offsets[name]
+    data["geometry"] = coordinates.array
+    data["geometry_offsets"] = offsets["geometry"]
+    data["coordinate_offsets"] = coordinate_offsets
+    data["atom_offsets"] = atom_offsets
+    data["atomic_numbers"] = atomic_numbers.array
+    return data
+
+
+def file_trajectory(data, i):
+    """第 i 个文件的轨迹：{各量数组, "geometry": (步数, 原子数, 3), "atomic_numbers"}"""
+    result = {name: data[name][data[name + "_offsets"][i]:data[name + "_offsets"][i + 1]]
+              for name in STEP_QUANTITIES}
+    atoms = slice(data["atom_offsets"][i], data["atom_offsets"][i + 1])
+    atom_count = atoms.stop - atoms.start
+    frames = data["geometry_offsets"][i + 1] - data["geometry_offsets"][i]
+    rows = slice(data["coordinate_offsets"][i], data["coordinate_offsets"][i + 1])
+    result["geometry"] = data["geometry"][rows].reshape(frames, atom_count, 3)
+    result["atomic_numbers"] = data["atomic_numbers"][atoms]
+    return result
+
+
+def final_values(data, name):
+    """每个文件最后一步的 name 值（没有该量的文件为 NaN），一次向量化计算"""
+    offsets = data[name + "_offsets"]
+    counts = np.diff(offsets)
+    result = np.full(len(counts), np.nan)
+    present = counts > 0
+    result[present] = data[name][offsets[1:][present] - 1]
+    return result
+
+
+def step_counts(data, name="energy"):
+    """每个文件的步数"""
+    return np.diff(data[name + "_offsets"])
+
+
+def save_trajectories(data, output, fmt=None):
+    """保存轨迹：npz 为单个未压缩文件；npy 为目录，每个数组一个 .npy 文件，可内存映射载入"""
+    fmt = fmt or ("npz" if output.lower().endswith(".npz") else "npy")
+    if fmt not in TRAJECTORY_FORMATS:
+        raise ValueError(f"不支持的轨迹格式: {fmt}")
+    if fmt == "npz":
+        np.savez(output, **data)
+        return
+    os.makedirs(output, exist_ok=True)
+    for name, array in data.items():
+        np.save(os.path.join(output, name + ".npy"), array)
+
+
+def load_trajectories(path, mmap=True):
+    """载入 save_trajectories() 保存的轨迹
+
+    目录中的数值数组在 mmap=True 时以只读内存映射方式打开，只有访问到的部分才从磁盘读入。
+    """
+    if os.path.isdir(path):
+        return {name[:-4]: np.load(os.path.join(path, name), mmap_mode="r" if mmap else None)
+                for name in sorted(os.listdir(path)) if name.endswith(".npy")}
+    with np.load(path) as archive:
+        return {name: archive[name] for name in archive.files}
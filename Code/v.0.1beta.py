@@ -1,11 +1,33 @@
-import pandas as pd
-import re
 import os
-import numpy as np
+import re
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import sys
 import platform
+import sqlite3
+
+# pandas、NumPy 与 Boltzmann 分析模块在首次构建数据表时才导入，启动时只加载 tkinter 与标准库
+from gaussian_core import (COLUMNS, DEFAULT_CACHE_PATH, DEFAULT_DIAGNOSTICS_PATH, DEFAULT_QUANTITIES,
+                           DEFAULT_TEMPERATURE, DIAGNOSTIC_LABELS, EXTRACTORS, GROUP_COLUMN, LOG_SUFFIXES, NAME_COLUMN,
+                           TOTAL_COLUMN, IncrementalScanner, ParseCache, build_columns, build_match_rules,
+                           collect_file_patterns, diagnose_files, diagnostics_summary, extract_files,
+                           is_analysis_column, match_files, result_columns, stream_rows, write_diagnostics)
+from gaussian_discovery import discover_logs, discovery_summary
+from gaussian_export import CHART_MAX_ROWS, LARGE_EXPORT_ROWS, export_format, export_frame, open_sink
+from gaussian_profiling import PROFILER
+from gaussian_shard import MANIFEST_SUFFIX, load_manifest, load_partials, merge_partials, plan_shards, write_manifest
+from gaussian_store import DEFAULT_PROJECT_PATH, ResultStore, describe_run
+from gaussian_tasks import TaskCancelled, TaskRunner
+
+
+# 文件对话框中的日志类型（含压缩日志）
+LOG_FILETYPES = " ".join("*" + suffix for suffix in LOG_SUFFIXES)
+
+# 结果表格每页显示的行数
+PAGE_SIZE = 500
+
+# 监视模式的轮询间隔（毫秒）
+WATCH_INTERVAL_MS = 5000
 
 
 class GaussianEnergyAnalyzer:
@@ -21,7 +43,38 @@ class GaussianEnergyAnalyzer:
         # 初始化数据
         self.scf_files = []
         self.gibbs_files = []
-        self.data = pd.DataFrame(columns=["文件名", "SCF能量(a.u.)", "Gibbs校正(a.u.)", "总能量(a.u.)"])
+        # 结果表（pandas DataFrame），首次提取或载入结果库时才创建
+        self.data = None
+
+        # 需要提取的物理量（EXTRACTORS 中的名称）
+        self.quantities = list(DEFAULT_QUANTITIES)
+
+        # 自动匹配规则（多个前缀/后缀用逗号分隔）
+        self.match_settings = {
+            "scf_prefixes": "sp_",
+            "scf_suffixes": "",
+            "gibbs_prefixes": "",
+            "gibbs_suffixes": "",
+            "scf_regex": "",
+            "gibbs_regex": "",
+            "scf_root": "",
+            "gibbs_root": "",
+        }
+
+        # 目录导入设置
+        self.discovery_settings = {
+            "directory": "",
+            "pattern": "",
+            "regex": False,
+            "check_termination": True,
+        }
+
+        # Boltzmann 分析：按文件名正则分组，计算组内相对能量、权重与加权平均值
+        self.analysis_settings = {
+            "enabled": False,
+            "pattern": "",
+            "temperature": DEFAULT_TEMPERATURE,
+        }
 
         # 创建主框架
         self.main_frame = ttk.Frame(root, padding=20)
@@ -72,26 +125,60 @@ class GaussianEnergyAnalyzer:
         process_frame = ttk.Frame(self.main_frame)
         process_frame.pack(fill=tk.X, pady=10)
 
+        ttk.Button(process_frame, text="导入目录", command=self.import_directory_dialog).pack(side=tk.LEFT, padx=10)
         ttk.Button(process_frame, text="自动匹配", command=self.auto_match).pack(side=tk.LEFT, padx=10)
+        ttk.Button(process_frame, text="匹配规则", command=self.match_rules_dialog).pack(side=tk.LEFT, padx=10)
         ttk.Button(process_frame, text="手动匹配", command=self.manual_match).pack(side=tk.LEFT, padx=10)
+        ttk.Button(process_frame, text="选择物理量", command=self.select_quantities).pack(side=tk.LEFT, padx=10)
+        ttk.Button(process_frame, text="Boltzmann分析", command=self.analysis_dialog).pack(side=tk.LEFT, padx=10)
         ttk.Button(process_frame, text="提取能量数据", command=self.extract_energies).pack(side=tk.LEFT, padx=10)
+        ttk.Button(process_frame, text="取消任务", command=self.cancel_tasks).pack(side=tk.LEFT, padx=10)
+
+        # 并行进程数
+        self.workers_var = tk.IntVar(value=os.cpu_count() or 1)
+        ttk.Spinbox(process_frame, from_=1, to=max(os.cpu_count() or 1, 64), width=5,
+                    textvariable=self.workers_var).pack(side=tk.RIGHT, padx=5)
+        ttk.Label(process_frame, text="并行进程数:").pack(side=tk.RIGHT)
+
+        # 解析缓存
+        self.use_cache_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(process_frame, text="使用缓存", variable=self.use_cache_var).pack(side=tk.RIGHT, padx=10)
+        ttk.Button(process_frame, text="清空缓存", command=self.clear_cache).pack(side=tk.RIGHT, padx=10)
+        self.cache = None
+
+        # Link1 多步作业按步骤提取（Gibbs 类取自频率步骤，其余取自最后一步）
+        self.link1_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(process_frame, text="Link1分步", variable=self.link1_var).pack(side=tk.RIGHT, padx=10)
+
+        # 监视模式：定时只解析日志新增的内容
+        self.watch_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(process_frame, text="监视模式", variable=self.watch_var,
+                        command=self.toggle_watch).pack(side=tk.RIGHT, padx=10)
+        self.watch_scanner = IncrementalScanner()
+        self.watch_job = None
+        self.watch_plan_key = None
+        self.watch_rows = {}
+
+        # 项目结果库：每次提取的结果追加保存，启动后在后台载入最近一次结果
+        self.store = None
 
         # 表格显示
         table_frame = ttk.LabelFrame(self.main_frame, text="能量数据", padding=10)
         table_frame.pack(fill=tk.BOTH, expand=True, pady=10)
 
-        # 创建表格
-        self.tree = ttk.Treeview(table_frame, columns=("SCF能量", "Gibbs校正", "总能量"), show="headings")
-        self.tree.heading("#0", text="文件名")
-        self.tree.heading("SCF能量", text="SCF能量(a.u.)")
-        self.tree.heading("Gibbs校正", text="Gibbs校正(a.u.)")
-        self.tree.heading("总能量", text="总能量(a.u.)")
+        # 分页控制：表格只生成当前页的行，数据量再大重绘也只需插入一页
+        self.page = 0
+        self.page_var = tk.StringVar(value="")
+        page_frame = ttk.Frame(table_frame)
+        page_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+        ttk.Button(page_frame, text="下一页", command=lambda: self.change_page(1)).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(page_frame, text="上一页", command=lambda: self.change_page(-1)).pack(side=tk.RIGHT, padx=2)
+        ttk.Label(page_frame, textvariable=self.page_var).pack(side=tk.RIGHT, padx=10)
 
-        # 设置列宽
-        self.tree.column("#0", width=250)
-        self.tree.column("SCF能量", width=150)
-        self.tree.column("Gibbs校正", width=150)
-        self.tree.column("总能量", width=150)
+        # 创建表格（列随所选物理量变化）
+        self.tree = ttk.Treeview(table_frame, show="headings")
+        self.table_columns = []
+        self.configure_table_columns(COLUMNS)
 
         # 添加滚动条
         scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
@@ -104,12 +191,39 @@ class GaussianEnergyAnalyzer:
         export_frame.pack(fill=tk.X, pady=10)
 
         ttk.Button(export_frame, text="导出为Excel", command=self.export_to_excel).pack(side=tk.RIGHT, padx=10)
+        ttk.Button(export_frame, text="提取并直接导出", command=self.stream_export).pack(side=tk.RIGHT, padx=10)
+        ttk.Button(export_frame, text="性能统计", command=self.profiling_dialog).pack(side=tk.LEFT, padx=10)
+        ttk.Button(export_frame, text="结果库", command=self.project_dialog).pack(side=tk.LEFT, padx=10)
+        ttk.Button(export_frame, text="生成分片清单", command=self.plan_shards_dialog).pack(side=tk.LEFT, padx=10)
+        ttk.Button(export_frame, text="合并分片", command=self.merge_shards_dialog).pack(side=tk.LEFT, padx=10)
 
         # 状态栏
         self.status_var = tk.StringVar(value="就绪")
         ttk.Label(self.main_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W).pack(
             fill=tk.X, pady=5)
 
+        # 后台任务（提取、匹配、导出）在工作线程中执行，界面保持响应
+        self.tasks = TaskRunner(self.root, self.status_var.set)
+
+        # 窗口显示后再打开缓存与结果库并载入最近一次结果，不阻塞启动
+        self.root.after(0, self.open_project)
+
+    def open_project(self):
+        """打开解析缓存与项目结果库（数据库文件可能在较慢的网络目录中），然后载入最近一次结果"""
+        try:
+            self.cache = ParseCache()
+        except (OSError, sqlite3.Error):
+            self.cache = None
+        try:
+            self.store = ResultStore()
+        except (OSError, sqlite3.Error):
+            self.store = None
+        self.load_run()
+
+    def has_data(self):
+        """是否已有结果表"""
+        return self.data is not None and not self.data.empty
+
     def set_icon(self):
         """尝试设置应用图标（如果可用）"""
         try:
@@ -121,7 +235,7 @@ class GaussianEnergyAnalyzer:
     def add_scf_files(self):
         files = filedialog.askopenfilenames(
             title="选择SCF Done文件",
-            filetypes=[("Gaussian输出文件", "*.log"), ("所有文件", "*.*")]
+            filetypes=[("Gaussian输出文件", LOG_FILETYPES), ("所有文件", "*.*")]
         )
         if files:
             self.scf_files.extend(files)
@@ -131,7 +245,7 @@ class GaussianEnergyAnalyzer:
     def add_gibbs_files(self):
         files = filedialog.askopenfilenames(
             title="选择Gibbs校正文件",
-            filetypes=[("Gaussian输出文件", "*.log"), ("所有文件", "*.*")]
+            filetypes=[("Gaussian输出文件", LOG_FILETYPES), ("所有文件", "*.*")]
         )
         if files:
             self.gibbs_files.extend(files)
@@ -166,55 +280,173 @@ class GaussianEnergyAnalyzer:
                 del files_list[idx]
             self.update_listbox(listbox, files_list)
 
+    def current_match_rules(self):
+        """由匹配规则设置构造规则列表"""
+        settings = self.match_settings
+
+        def split(name):
+            return [item.strip() for item in settings[name].split(",") if item.strip()]
+
+        return build_match_rules(
+            scf_prefixes=split("scf_prefixes"), scf_suffixes=split("scf_suffixes"),
+            gibbs_prefixes=split("gibbs_prefixes"), gibbs_suffixes=split("gibbs_suffixes"),
+            scf_regex=settings["scf_regex"] or None, gibbs_regex=settings["gibbs_regex"] or None,
+            scf_root=settings["scf_root"] or None, gibbs_root=settings["gibbs_root"] or None)
+
+    def match_rules_dialog(self):
+        """编辑自动匹配规则"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("自动匹配规则")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        frame = ttk.Frame(dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        fields = [
+            ("scf_prefixes", "SCF文件名前缀"),
+            ("scf_suffixes", "SCF文件名后缀"),
+            ("gibbs_prefixes", "Gibbs文件名前缀"),
+            ("gibbs_suffixes", "Gibbs文件名后缀（如 _freq,_opt）"),
+            ("scf_regex", "SCF文件名正则（捕获组为键）"),
+            ("gibbs_regex", "Gibbs文件名正则（留空同SCF）"),
+            ("scf_root", "SCF根目录（平行目录布局）"),
+            ("gibbs_root", "Gibbs根目录（平行目录布局）"),
+        ]
+        variables = {}
+        for row, (name, label) in enumerate(fields):
+            ttk.Label(frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=2)
+            variables[name] = tk.StringVar(value=self.match_settings[name])
+            ttk.Entry(frame, textvariable=variables[name], width=40).grid(row=row, column=1, padx=5, pady=2)
+
+        def apply_rules():
+            previous = dict(self.match_settings)
+            self.match_settings.update({name: var.get().strip() for name, var in variables.items()})
+            try:
+                self.current_match_rules()
+            except re.error as e:
+                self.match_settings.update(previous)
+                messagebox.showerror("规则错误", f"正则表达式无效:\n{e}", parent=dialog)
+                return
+            self.status_var.set("匹配规则已更新")
+            dialog.destroy()
+
+        control_frame = ttk.Frame(dialog)
+        control_frame.pack(fill=tk.X, pady=10)
+        ttk.Button(control_frame, text="应用", command=apply_rules).pack(side=tk.RIGHT, padx=10)
+        ttk.Button(control_frame, text="取消", command=dialog.destroy).pack(side=tk.RIGHT, padx=10)
+
     def auto_match(self):
         """根据文件名自动匹配SCF和Gibbs文件"""
         if not self.scf_files:
             messagebox.showwarning("无文件", "请先添加SCF文件")
             return
+        if self.tasks_busy():
+            return
 
-        # 创建匹配字典
-        scf_basenames = {os.path.basename(f)[3:] for f in self.scf_files if os.path.basename(f).startswith("sp_")}
-        gibbs_basenames = [os.path.basename(f) for f in self.gibbs_files]
-
-        # 自动重新排序Gibbs文件列表以匹配SCF顺序
-        new_gibbs_files = []
-        unmatched = []
-
-        for scf_file in self.scf_files:
-            scf_base = os.path.basename(scf_file)
-            if scf_base.startswith("sp_"):
-                base_name = scf_base[3:]
-                found = False
-
-                # 查找匹配的Gibbs文件
-                for gibbs_file in self.gibbs_files:
-                    if os.path.basename(gibbs_file) == base_name:
-                        new_gibbs_files.append(gibbs_file)
-                        found = True
-                        break
-
-                if not found:
-                    new_gibbs_files.append(None)
-                    unmatched.append(scf_base)
-            else:
-                new_gibbs_files.append(None)
-                unmatched.append(scf_base)
-
-        # 添加未匹配的Gibbs文件
-        for gibbs_file in self.gibbs_files:
-            if os.path.basename(gibbs_file) not in [os.path.basename(f) for f in new_gibbs_files if f]:
-                new_gibbs_files.append(gibbs_file)
-                self.scf_files.append(None)  # 添加对应的SCF空值
+        scf_files, gibbs_files, rules = list(self.scf_files), list(self.gibbs_files), self.current_match_rules()
+        self.tasks.submit("自动匹配", lambda task: match_files(scf_files, gibbs_files, rules),
+                          self.apply_match, lambda e: messagebox.showerror("匹配错误", str(e)))
 
-        self.gibbs_files = new_gibbs_files
+    def apply_match(self, result):
+        """显示自动匹配的结果（界面线程）"""
+        self.scf_files, self.gibbs_files, report = result
         self.update_listbox(self.scf_listbox, [f if f else "(无匹配文件)" for f in self.scf_files])
         self.update_listbox(self.gibbs_listbox, [f if f else "(无匹配文件)" for f in self.gibbs_files])
 
+        unmatched = report["unmatched"]
         if unmatched:
             self.status_var.set(f"自动匹配完成，{len(unmatched)}个SCF文件未找到对应Gibbs文件")
         else:
             self.status_var.set("所有SCF文件已成功匹配对应Gibbs文件")
 
+        # 报告有歧义或重复的匹配
+        details = [f"{name}: {', '.join(candidates)}" for name, candidates in report["ambiguous"].items()]
+        details += [f"{name} <- {', '.join(names)}" for name, names in report["duplicates"].items()]
+        if details:
+            messagebox.showwarning("匹配需要确认",
+                                   f"{len(report['ambiguous'])} 个SCF文件有多个候选Gibbs文件，"
+                                   f"{len(report['duplicates'])} 个Gibbs文件被多个SCF文件使用:\n" +
+                                   "\n".join(details[:20]))
+
+    def import_directory_dialog(self):
+        """递归导入目录中的日志：按文件名过滤、跳过未正常结束的文件，按路由部分分为单点/频率后自动匹配"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("导入目录")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        frame = ttk.Frame(dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        settings = self.discovery_settings
+        directory_var = tk.StringVar(value=settings["directory"])
+        pattern_var = tk.StringVar(value=settings["pattern"])
+        regex_var = tk.BooleanVar(value=settings["regex"])
+        termination_var = tk.BooleanVar(value=settings["check_termination"])
+
+        def browse():
+            directory = filedialog.askdirectory(parent=dialog, title="选择目录", mustexist=True)
+            if directory:
+                directory_var.set(directory)
+
+        ttk.Label(frame, text="目录").grid(row=0, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=directory_var, width=40).grid(row=0, column=1, padx=5, pady=2)
+        ttk.Button(frame, text="浏览", command=browse).grid(row=0, column=2, pady=2)
+        ttk.Label(frame, text="文件名过滤（如 *_conf*，留空为全部）").grid(row=1, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=pattern_var, width=40).grid(row=1, column=1, padx=5, pady=2)
+        ttk.Checkbutton(frame, text="按正则表达式匹配完整路径", variable=regex_var).grid(
+            row=2, column=0, columnspan=2, sticky=tk.W, pady=2)
+        ttk.Checkbutton(frame, text="跳过未正常结束的文件", variable=termination_var).grid(
+            row=3, column=0, columnspan=2, sticky=tk.W, pady=2)
+
+        def apply_import():
+            directory = directory_var.get().strip()
+            if not os.path.isdir(directory):
+                messagebox.showerror("目录错误", f"目录不存在: {directory}", parent=dialog)
+                return
+            if regex_var.get():
+                try:
+                    re.compile(pattern_var.get().strip())
+                except re.error as e:
+                    messagebox.showerror("规则错误", f"正则表达式无效:\n{e}", parent=dialog)
+                    return
+            settings.update(directory=directory, pattern=pattern_var.get().strip(), regex=regex_var.get(),
+                            check_termination=termination_var.get())
+            dialog.destroy()
+            self.import_directory(directory)
+
+        control_frame = ttk.Frame(dialog)
+        control_frame.pack(fill=tk.X, pady=10)
+        ttk.Button(control_frame, text="导入", command=apply_import).pack(side=tk.RIGHT, padx=10)
+        ttk.Button(control_frame, text="取消", command=dialog.destroy).pack(side=tk.RIGHT, padx=10)
+
+    def import_directory(self, directory):
+        """在后台查找并分类目录中的日志，追加到文件列表后按当前规则自动匹配"""
+        if self.tasks_busy():
+            return
+        settings = dict(self.discovery_settings)
+        scf_files, gibbs_files, rules = list(self.scf_files), list(self.gibbs_files), self.current_match_rules()
+        workers = self.worker_count()
+
+        def work(task):
+            found = discover_logs([directory], settings["pattern"], settings["regex"],
+                                  settings["check_termination"], workers, lambda: task.cancelled)
+            task.check()
+            known = set(scf_files) | set(gibbs_files)
+            result = match_files(scf_files + [f for f in found["scf"] if f not in known],
+                                 gibbs_files + [f for f in found["gibbs"] if f not in known], rules)
+            return found, result
+
+        def done(value):
+            found, result = value
+            self.apply_match(result)
+            self.status_var.set(f"已导入 {directory}：{discovery_summary(found) or '没有找到日志文件'}；"
+                                + self.status_var.get())
+
+        self.tasks.submit("导入目录", work, done, lambda e: messagebox.showerror("导入错误", str(e)),
+                          lambda: self.status_var.set("目录导入已取消"))
+
     def manual_match(self):
         """手动调整SCF和Gibbs文件顺序"""
         if not self.scf_files and not self.gibbs_files:
@@ -309,303 +541,677 @@ class GaussianEnergyAnalyzer:
         ttk.Button(control_frame, text="应用", command=apply_changes).pack(side=tk.RIGHT, padx=10)
         ttk.Button(control_frame, text="取消", command=match_dialog.destroy).pack(side=tk.RIGHT, padx=10)
 
-    def extract_value(self, file_path, pattern):
-        """从文件中提取指定值"""
-        if not file_path:
-            return None
+    def active_cache(self):
+        """返回当前启用的缓存（未启用或不可用时为 None）"""
+        return self.cache if self.cache is not None and self.use_cache_var.get() else None
 
+    def clear_cache(self):
+        """清空持久化解析缓存"""
+        if self.cache is None:
+            messagebox.showwarning("缓存不可用", f"无法打开缓存文件:\n{DEFAULT_CACHE_PATH}")
+            return
+        if self.tasks_busy():
+            return
+        self.cache.clear()
+        self.status_var.set("解析缓存已清空")
+
+    def tasks_busy(self):
+        """已有后台任务在执行时提示并返回 True"""
+        if self.tasks.busy:
+            messagebox.showwarning("请稍候", "已有任务正在执行，请等待完成或先取消")
+            return True
+        return False
+
+    def cancel_tasks(self):
+        """请求取消正在进行的后台任务"""
+        self.tasks.cancel()
+
+    def worker_count(self):
+        """界面中设置的并行进程数"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                match = re.search(pattern, content)
-                if match:
-                    return float(match.group(1))
-                else:
-                    return None
-        except Exception as e:
-            self.status_var.set(f"文件读取错误: {os.path.basename(file_path)}")
-            return None
+            return max(1, int(self.workers_var.get()))
+        except (tk.TclError, ValueError):
+            return 1
 
-    def extract_energies(self):
-        """从所有文件中提取能量数据"""
+    def extract_energies(self, chunk_size=64):
+        """在后台用进程池提取所有文件的能量数据，完成后更新表格"""
         if not self.scf_files:
             messagebox.showwarning("无文件", "请先添加SCF文件")
             return
+        if self.tasks_busy():
+            return
 
-        # 准备数据列表
-        data = []
-        scf_pattern = r"SCF Done:\s+E\(.*\)\s+=\s+([-\d.]+)\s+A.U."
-        gibbs_pattern = r"Thermal correction to Gibbs Free Energy=\s+([-\d.]+)"
-
-        # 为每个SCF-Gibbs对提取数据
-        for i, scf_file in enumerate(self.scf_files):
-            row = {}
-
-            # 获取文件名 - 以SCF文件名为准
-            if scf_file:
-                scf_base = os.path.basename(scf_file)
-                base_name = scf_base[3:] if scf_base.startswith("sp_") else scf_base
-                row["文件名"] = os.path.splitext(base_name)[0]
+        quantities = list(self.quantities)
+        scf_files, gibbs_files = list(self.scf_files), list(self.gibbs_files)
+        file_patterns = collect_file_patterns(scf_files, gibbs_files, quantities, self.link1_var.get())
+        workers, cache = self.worker_count(), self.active_cache()
+
+        def work(task):
+            results, errors = extract_files(file_patterns, workers, chunk_size, cache,
+                                            task.report, lambda: task.cancelled)
+            if results is None:
+                raise TaskCancelled()
+            # 一次提取即报告所有有问题的文件，并写入诊断日志
+            diagnostics = diagnose_files(file_patterns, results, errors)
+            try:
+                write_diagnostics(diagnostics, DEFAULT_DIAGNOSTICS_PATH)
+            except OSError:
+                pass
+            return results, diagnostics
+
+        def done(result):
+            file_values, diagnostics = result
+            self.show_diagnostics(diagnostics)
+            # 更新表格显示
+            self.set_data(file_values, quantities, scf_files, gibbs_files)
+            self.page = 0
+            self.update_table()
+            self.status_var.set("能量数据提取完成")
+            self.save_run(scf_files, gibbs_files, file_values, quantities)
+
+        self.tasks.submit("提取能量数据", work, done,
+                          lambda e: messagebox.showerror("提取错误", str(e)),
+                          lambda: self.status_var.set("能量数据提取已取消"))
+
+    def show_diagnostics(self, diagnostics):
+        """提示有问题的文件（界面线程）"""
+        if not diagnostics:
+            return
+        details = [f"{DIAGNOSTIC_LABELS[category]}: {os.path.basename(f)}（{detail}）"
+                   for f, (category, detail) in list(diagnostics.items())[:20]]
+        messagebox.showwarning("文件诊断",
+                               f"{len(diagnostics)} 个文件有问题（{diagnostics_summary(diagnostics)}）:\n" +
+                               "\n".join(details) + f"\n\n完整诊断日志: {DEFAULT_DIAGNOSTICS_PATH}")
+
+    def stream_export(self):
+        """逐批提取并直接写入文件，不构建表格，提取结果只按批保留在内存中（适合文件很多的项目）"""
+        if not self.scf_files:
+            messagebox.showwarning("无文件", "请先添加SCF文件")
+            return
+        if self.tasks_busy():
+            return
+        output_file = filedialog.asksaveasfilename(
+            title="提取并直接导出",
+            defaultextension=".csv",
+            filetypes=[("CSV文件", "*.csv"), ("Parquet文件", "*.parquet"), ("Excel文件", "*.xlsx"),
+                       ("JSON文件", "*.json"), ("所有文件", "*.*")]
+        )
+        if not output_file:
+            return
+        try:
+            fmt = export_format(output_file) if os.path.splitext(output_file)[1] else "csv"
+        except ValueError as e:
+            messagebox.showerror("导出错误", str(e))
+            return
 
-                # 提取SCF值
-                scf_value = self.extract_value(scf_file, scf_pattern)
-                row["SCF能量(a.u.)"] = scf_value
-            else:
-                row["文件名"] = ""
-                row["SCF能量(a.u.)"] = None
-
-            # 获取对应的Gibbs值
-            gibbs_file = self.gibbs_files[i] if i < len(self.gibbs_files) else None
-            if gibbs_file:
-                gibbs_value = self.extract_value(gibbs_file, gibbs_pattern)
-                row["Gibbs校正(a.u.)"] = gibbs_value
-            else:
-                row["Gibbs校正(a.u.)"] = None
+        quantities = list(self.quantities)
+        scf_files, gibbs_files = list(self.scf_files), list(self.gibbs_files)
+        link1, workers, cache = self.link1_var.get(), self.worker_count(), self.active_cache()
+
+        def work(task):
+            diagnostics = {}
+            with open_sink(output_file, result_columns(quantities), fmt) as sink:
+                for rows in stream_rows(scf_files, gibbs_files, quantities, link1, workers, cache=cache,
+                                        progress=task.report, cancelled=lambda: task.cancelled,
+                                        diagnostics=diagnostics):
+                    sink.write(rows)
+            task.check()
+            try:
+                write_diagnostics(diagnostics, DEFAULT_DIAGNOSTICS_PATH)
+            except OSError:
+                pass
+            return sink.row_count, diagnostics
+
+        def done(result):
+            count, diagnostics = result
+            self.show_diagnostics(diagnostics)
+            self.status_var.set(f"已提取并导出 {count} 行到: {output_file}")
+
+        self.tasks.submit("提取并导出", work, done, self.export_failed,
+                          lambda: self.status_var.set("提取并导出已取消（文件只包含已完成的部分）"))
+
+    def set_data(self, file_values, quantities, scf_files=None, gibbs_files=None):
+        """由提取结果构建数据表"""
+        scf_files = self.scf_files if scf_files is None else scf_files
+        gibbs_files = self.gibbs_files if gibbs_files is None else gibbs_files
+        self.set_columns(*build_columns(scf_files, gibbs_files, file_values, quantities), quantities)
+
+    @PROFILER.timed("table_build")
+    def set_columns(self, names, values, quantities):
+        """按列构建数据表，总能量用NumPy整列计算（缺失值为NaN）"""
+        import numpy as np
+        import pandas as pd
+        arrays = {name: np.array(values[name], dtype=np.float64) for name in quantities}
+        table = {NAME_COLUMN: names}
+        table.update((EXTRACTORS[name].label, arrays[name]) for name in quantities)
+        if TOTAL_COLUMN in result_columns(quantities):
+            table[TOTAL_COLUMN] = arrays["scf"] + arrays["gibbs"]
+        self.data = self.analyze(pd.DataFrame(table))
+
+    def analyze(self, frame):
+        """按当前设置追加 Boltzmann 分析列（未开启或没有能量列时原样返回）"""
+        import numpy as np
+        from gaussian_analysis import boltzmann_columns, energy_column
+        frame = frame[[col for col in frame.columns if not is_analysis_column(col)]]
+        settings = self.analysis_settings
+        if not settings["enabled"]:
+            return frame
+        energy = energy_column(frame)
+        if energy is None:
+            return frame
+        columns = {col: frame[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in frame.columns[1:]}
+        analysis = boltzmann_columns(frame[NAME_COLUMN].astype(str).tolist(), columns, energy,
+                                     settings["pattern"], settings["temperature"])
+        return frame.assign(**analysis)
+
+    def save_run(self, scf_files, gibbs_files, file_values, quantities):
+        """在后台把提取结果追加到结果库"""
+        if self.store is None:
+            return
+        self.tasks.submit("保存到结果库",
+                          lambda task: self.store.append_run(scf_files, gibbs_files, file_values, quantities),
+                          lambda run_id: self.status_var.set(f"能量数据提取完成，已保存为结果库记录 #{run_id}"),
+                          lambda e: self.status_var.set(f"保存到结果库失败: {e}"))
+
+    def load_run(self, run_id=None):
+        """在后台从结果库载入一次提取（默认最近一次），不需要原始日志文件"""
+        if self.store is None or self.tasks.busy:
+            return
+        self.tasks.submit("载入结果库", lambda task: self.store.load_run(run_id, provenance=False), self.apply_run,
+                          lambda e: self.status_var.set(f"载入结果库失败: {e}"))
+
+    def apply_run(self, result):
+        """显示从结果库载入的数据（界面线程）"""
+        run, data = result
+        if run is None:
+            self.status_var.set("就绪")
+            return
+        quantities = [name for name in run["quantities"] if name in EXTRACTORS]
+        self.quantities = quantities or list(DEFAULT_QUANTITIES)
+        self.scf_files, self.gibbs_files = data["scf_path"], data["gibbs_path"]
+        self.update_listbox(self.scf_listbox, [f if f else "(无匹配文件)" for f in self.scf_files])
+        self.update_listbox(self.gibbs_listbox, [f if f else "(无匹配文件)" for f in self.gibbs_files])
+        self.set_columns(data["molecule"], data["values"], quantities)
+        self.page = 0
+        self.update_table()
+        self.status_var.set(f"已从结果库载入 {describe_run(run)}")
+
+    def project_dialog(self):
+        """查看结果库中的历史提取，载入、导出或切换结果库文件"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("结果库")
+        dialog.geometry("640x400")
+        dialog.transient(self.root)
+
+        path_var = tk.StringVar()
+        ttk.Label(dialog, textvariable=path_var, padding=10).pack(fill=tk.X)
+        listbox = tk.Listbox(dialog)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10)
+        runs = []
+
+        def refresh():
+            path_var.set(f"结果库: {self.store.db_path if self.store else '不可用'}")
+            runs[:] = self.store.runs() if self.store else []
+            listbox.delete(0, tk.END)
+            for run in runs:
+                listbox.insert(tk.END, describe_run(run))
+
+        def selected_run():
+            selection = listbox.curselection()
+            if not selection:
+                messagebox.showwarning("未选择", "请先选择一条记录", parent=dialog)
+                return None
+            return runs[selection[0]]["id"]
+
+        def load():
+            run_id = selected_run()
+            if run_id is not None and not self.tasks_busy():
+                self.load_run(run_id)
+                dialog.destroy()
+
+        def export():
+            run_id = selected_run()
+            if run_id is None or self.tasks_busy():
+                return
+            output_file = filedialog.asksaveasfilename(
+                parent=dialog, title="导出结果", defaultextension=".parquet",
+                filetypes=[("Parquet文件", "*.parquet"), ("CSV文件", "*.csv"), ("JSON文件", "*.json"),
+                           ("Excel文件", "*.xlsx")])
+            if output_file:
+                self.tasks.submit("导出结果库", lambda task: self.store.export_run(output_file, run_id),
+                                  lambda count: self.status_var.set(f"已导出 {count} 行到: {output_file}"),
+                                  self.export_failed)
+
+        def open_other():
+            db_path = filedialog.asksaveasfilename(
+                parent=dialog, title="打开或新建结果库", defaultextension=".sqlite3",
+                initialfile=os.path.basename(DEFAULT_PROJECT_PATH), confirmoverwrite=False,
+                filetypes=[("结果库", "*.sqlite3"), ("所有文件", "*.*")])
+            if not db_path or self.tasks_busy():
+                return
+            try:
+                self.store = ResultStore(db_path)
+            except (OSError, sqlite3.Error) as e:
+                messagebox.showerror("无法打开结果库", str(e), parent=dialog)
+                return
+            refresh()
 
-            # 计算总能量（如果两项都存在）
-            if row["SCF能量(a.u.)"] is not None and row["Gibbs校正(a.u.)"] is not None:
-                row["总能量(a.u.)"] = row["SCF能量(a.u.)"] + row["Gibbs校正(a.u.)"]
-            else:
-                row["总能量(a.u.)"] = None
+        control_frame = ttk.Frame(dialog)
+        control_frame.pack(fill=tk.X, pady=10)
+        ttk.Button(control_frame, text="载入", command=load).pack(side=tk.LEFT, padx=10)
+        ttk.Button(control_frame, text="导出", command=export).pack(side=tk.LEFT, padx=10)
+        ttk.Button(control_frame, text="打开其他结果库", command=open_other).pack(side=tk.LEFT, padx=10)
+        ttk.Button(control_frame, text="关闭", command=dialog.destroy).pack(side=tk.RIGHT, padx=10)
+        refresh()
+
+    def plan_shards_dialog(self):
+        """把当前匹配好的文件对分成 N 片，写出分片清单（各节点用命令行 shard run 提取）"""
+        if not self.scf_files:
+            messagebox.showwarning("无文件", "请先添加SCF文件")
+            return
+        shards = simpledialog.askinteger("生成分片清单", "分片数（通常为节点数）:", parent=self.root,
+                                         initialvalue=4, minvalue=1)
+        if not shards:
+            return
+        output_file = filedialog.asksaveasfilename(title="保存分片清单", defaultextension=MANIFEST_SUFFIX,
+                                                   filetypes=[("分片清单", "*" + MANIFEST_SUFFIX), ("所有文件", "*.*")])
+        if not output_file:
+            return
+        try:
+            write_manifest(plan_shards(self.scf_files, self.gibbs_files, shards, self.quantities, self.link1_var.get()),
+                           output_file)
+        except OSError as e:
+            messagebox.showerror("保存失败", str(e))
+            return
+        self.status_var.set(f"已写出分片清单: {output_file}（各节点运行 gaussian_cli.py shard run 清单 --shard 编号）")
 
-            data.append(row)
+    def merge_shards_dialog(self):
+        """选择分片清单，合并清单旁各片的结果并按清单顺序显示"""
+        if self.tasks_busy():
+            return
+        manifest_file = filedialog.askopenfilename(title="选择分片清单",
+                                                   filetypes=[("分片清单", "*" + MANIFEST_SUFFIX),
+                                                              ("所有文件", "*.*")])
+        if not manifest_file:
+            return
 
-        # 更新表格显示
-        self.data = pd.DataFrame(data)
-        self.update_table()
-        self.status_var.set("能量数据提取完成")
+        def work(task):
+            manifest = load_manifest(manifest_file)
+            return manifest, merge_partials(manifest, load_partials(manifest_file, manifest))
 
-    def update_table(self):
-        """更新表格视图以显示当前数据"""
-        # 清空现有内容
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        def done(result):
+            manifest, (scf_files, gibbs_files, file_values, errors) = result
+            quantities = manifest["quantities"]
+            self.quantities = list(quantities)
+            self.scf_files, self.gibbs_files = scf_files, gibbs_files
+            self.update_listbox(self.scf_listbox, [f if f else "(无匹配文件)" for f in self.scf_files])
+            self.update_listbox(self.gibbs_listbox, [f if f else "(无匹配文件)" for f in self.gibbs_files])
+            self.set_data(file_values, quantities)
+            self.page = 0
+            self.update_table()
+            self.status_var.set(f"已合并 {manifest['shards']} 片，共 {len(scf_files)} 行" +
+                                (f"，{len(errors)} 个文件读取失败" if errors else ""))
+            self.save_run(scf_files, gibbs_files, file_values, quantities)
+
+        self.tasks.submit("合并分片", work, done, lambda e: messagebox.showerror("合并错误", str(e)))
+
+    def toggle_watch(self):
+        """开启或关闭监视模式"""
+        if self.watch_job is not None:
+            self.root.after_cancel(self.watch_job)
+            self.watch_job = None
+        if not self.watch_var.get():
+            self.status_var.set("监视模式已关闭")
+            return
+        if not self.scf_files:
+            messagebox.showwarning("警告", "请先添加SCF文件")
+            self.watch_var.set(False)
+            return
+        self.watch_scanner = IncrementalScanner(self.link1_var.get())
+        self.watch_tick()
+
+    def schedule_watch(self):
+        """安排下一次监视轮询"""
+        if self.watch_var.get() and self.watch_job is None:
+            self.watch_job = self.root.after(WATCH_INTERVAL_MS, self.watch_tick)
+
+    def watch_tick(self):
+        """监视模式的一次轮询：后台只解析新增内容，完成后只更新受影响的行"""
+        self.watch_job = None
+        if not self.watch_var.get():
+            return
+        if self.tasks.busy:
+            self.schedule_watch()
+            return
+        quantities = list(self.quantities)
+        link1 = self.link1_var.get()
+        if self.watch_scanner.link1 != link1:
+            self.watch_scanner = IncrementalScanner(link1)
+        file_patterns = self.watch_plan(quantities, link1)
+        scanner = self.watch_scanner
+
+        def done(result):
+            if self.watch_var.get() and scanner is self.watch_scanner:
+                self.apply_watch(result, file_patterns, quantities)
+            self.schedule_watch()
+
+        def failed(e):
+            self.status_var.set(f"监视出错: {e}")
+            self.schedule_watch()
+
+        self.tasks.submit("检查日志更新", lambda task: scanner.update_many(file_patterns), done, failed,
+                          self.schedule_watch)
+
+    def watch_plan(self, quantities, link1):
+        """监视用的 {文件: patterns}；同时记录每个文件对应的 (行号, 物理量)，文件列表与设置不变时复用"""
+        key = (list(self.scf_files), list(self.gibbs_files), quantities, link1)
+        if key != self.watch_plan_key:
+            self.watch_plan_key = key
+            self.watch_patterns = collect_file_patterns(self.scf_files, self.gibbs_files, quantities, link1)
+            self.watch_rows = {}
+            for i, scf_file in enumerate(self.scf_files):
+                gibbs_file = self.gibbs_files[i] if i < len(self.gibbs_files) else None
+                for name in quantities:
+                    source = gibbs_file if EXTRACTORS[name].source == "gibbs" else scf_file
+                    if source:
+                        self.watch_rows.setdefault(source, []).append((i, name))
+        return self.watch_patterns
+
+    def apply_watch(self, result, file_patterns, quantities):
+        """把一次监视轮询的结果写入表格"""
+        changed, errors = result
+        columns = [col for col in self.data.columns if not is_analysis_column(col)] if self.data is not None else []
+        if columns != result_columns(quantities) or len(self.data) != len(self.scf_files):
+            # 文件列表或物理量已变化，用监视状态重建整个表格
+            states = self.watch_scanner.states
+            self.set_data({path: states[path]["values"] if path in states else {} for path in file_patterns},
+                          quantities)
+            self.update_table()
+            message = f"监视中：已重建 {len(self.data)} 行"
+        else:
+            rows = self.update_rows(changed)
+            if rows and self.analysis_settings["enabled"]:
+                # 一个构象的能量变化会改变整组的权重，重新计算后刷新当前页
+                self.data = self.analyze(self.data)
+                self.update_table()
+            message = f"监视中：更新 {len(rows)} 行" if rows else "监视中：没有新的输出"
+        if errors:
+            message += f"，{len(errors)} 个文件读取错误"
+        self.status_var.set(message)
+
+    @PROFILER.timed("render")
+    def update_rows(self, changed):
+        """把有变化文件的新数值写入 self.data 对应的行（见 watch_plan），并刷新当前页中这些行"""
+        rows = set()
+        for file_path, values in changed.items():
+            for i, name in self.watch_rows.get(file_path, ()):
+                value = values.get(name)
+                self.data.at[i, EXTRACTORS[name].label] = float("nan") if value is None else value
+                rows.add(i)
+        if not rows:
+            return rows
+
+        rows = sorted(rows)
+        if TOTAL_COLUMN in self.data.columns:
+            self.data.loc[rows, TOTAL_COLUMN] = (self.data.loc[rows, EXTRACTORS["scf"].label] +
+                                                 self.data.loc[rows, EXTRACTORS["gibbs"].label])
+        visible = set(self.tree.get_children())
+        for i, values in zip(rows, self.format_rows(self.data.iloc[rows])):
+            if str(i) in visible:
+                self.tree.item(str(i), values=values)
+        return rows
+
+    def select_quantities(self):
+        """选择需要提取的物理量"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("选择物理量")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        frame = ttk.Frame(dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        variables = {}
+        for name, extractor in EXTRACTORS.items():
+            variables[name] = tk.BooleanVar(value=name in self.quantities)
+            source = "Gibbs文件" if extractor.source == "gibbs" else "SCF文件"
+            ttk.Checkbutton(frame, text=f"{extractor.label}（{source}）",
+                            variable=variables[name]).pack(anchor=tk.W, pady=2)
+
+        def apply_selection():
+            selected = [name for name, var in variables.items() if var.get()]
+            if not selected:
+                messagebox.showwarning("未选择", "请至少选择一个物理量", parent=dialog)
+                return
+            self.quantities = selected
+            self.status_var.set(f"已选择 {len(selected)} 个物理量")
+            dialog.destroy()
 
-        # 添加新数据
-        for _, row in self.data.iterrows():
-            scf_value = row["SCF能量(a.u.)"]
-            gibbs_value = row["Gibbs校正(a.u.)"]
-            total_value = row["总能量(a.u.)"]
+        control_frame = ttk.Frame(dialog)
+        control_frame.pack(fill=tk.X, pady=10)
+        ttk.Button(control_frame, text="应用", command=apply_selection).pack(side=tk.RIGHT, padx=10)
+        ttk.Button(control_frame, text="取消", command=dialog.destroy).pack(side=tk.RIGHT, padx=10)
+
+    def analysis_dialog(self):
+        """设置 Boltzmann 分析：分组正则与温度"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Boltzmann分析")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        frame = ttk.Frame(dialog, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        enabled_var = tk.BooleanVar(value=self.analysis_settings["enabled"])
+        pattern_var = tk.StringVar(value=self.analysis_settings["pattern"])
+        temperature_var = tk.StringVar(value=str(self.analysis_settings["temperature"]))
+        ttk.Checkbutton(frame, text="计算相对能量与Boltzmann权重", variable=enabled_var).grid(
+            row=0, column=0, columnspan=2, sticky=tk.W, pady=2)
+        ttk.Label(frame, text="分组正则（捕获组为组名，留空为一组）").grid(row=1, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=pattern_var, width=40).grid(row=1, column=1, padx=5, pady=2)
+        ttk.Label(frame, text="温度(K)").grid(row=2, column=0, sticky=tk.W, pady=2)
+        ttk.Entry(frame, textvariable=temperature_var, width=40).grid(row=2, column=1, padx=5, pady=2)
+        ttk.Label(frame, text="例如 ^(.+)_conf\\d+$ 把 mol1_conf1、mol1_conf2 归为 mol1 组").grid(
+            row=3, column=0, columnspan=2, sticky=tk.W, pady=2)
+
+        def apply_settings():
+            pattern = pattern_var.get().strip()
+            try:
+                re.compile(pattern)
+                temperature = float(temperature_var.get())
+                if temperature <= 0:
+                    raise ValueError(f"温度必须大于0 K: {temperature}")
+            except (re.error, ValueError) as e:
+                messagebox.showerror("设置错误", str(e), parent=dialog)
+                return
+            self.analysis_settings.update(enabled=enabled_var.get(), pattern=pattern, temperature=temperature)
+            dialog.destroy()
+            if not self.has_data():
+                self.status_var.set("Boltzmann分析设置已更新")
+                return
+            from gaussian_analysis import energy_column
+            if enabled_var.get() and energy_column(self.data) is None:
+                messagebox.showwarning("无能量数据", "Boltzmann分析需要SCF能量或总能量数据")
+            self.data = self.analyze(self.data)
+            self.update_table()
+            self.status_var.set("Boltzmann分析已更新" if enabled_var.get() else "Boltzmann分析已关闭")
+
+        control_frame = ttk.Frame(dialog)
+        control_frame.pack(fill=tk.X, pady=10)
+        ttk.Button(control_frame, text="应用", command=apply_settings).pack(side=tk.RIGHT, padx=10)
+        ttk.Button(control_frame, text="取消", command=dialog.destroy).pack(side=tk.RIGHT, padx=10)
+
+    def profiling_dialog(self):
+        """查看、重置与导出性能统计"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("性能统计")
+        dialog.geometry("640x480")
+        dialog.transient(self.root)
+
+        enabled_var = tk.BooleanVar(value=PROFILER.enabled)
+        cprofile_var = tk.BooleanVar(value=PROFILER.cprofile is not None)
+
+        def apply_options():
+            if enabled_var.get():
+                PROFILER.enable(cprofile_var.get())
+            else:
+                PROFILER.disable()
+
+        option_frame = ttk.Frame(dialog, padding=10)
+        option_frame.pack(fill=tk.X)
+        ttk.Checkbutton(option_frame, text="启用性能统计", variable=enabled_var,
+                        command=apply_options).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(option_frame, text="函数级剖析 (cProfile)", variable=cprofile_var,
+                        command=apply_options).pack(side=tk.LEFT, padx=5)
+
+        text = tk.Text(dialog, font=("Courier", 10), wrap=tk.NONE)
+        text.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        def refresh():
+            text.delete("1.0", tk.END)
+            text.insert(tk.END, "\n".join(PROFILER.report_lines()))
+
+        def reset():
+            PROFILER.reset()
+            refresh()
+
+        def save(title, extension, writer):
+            output_file = filedialog.asksaveasfilename(parent=dialog, title=title, defaultextension=extension,
+                                                       filetypes=[(title, "*" + extension), ("所有文件", "*.*")])
+            if not output_file:
+                return
+            try:
+                writer(output_file)
+                self.status_var.set(f"性能统计已保存到: {output_file}")
+            except (OSError, ValueError) as e:
+                messagebox.showerror("保存失败", str(e), parent=dialog)
 
-            # 格式化显示值
-            scf_display = f"{scf_value:.8f}" if scf_value is not None else ""
-            gibbs_display = f"{gibbs_value:.8f}" if gibbs_value is not None else ""
-            total_display = f"{total_value:.8f}" if total_value is not None else ""
+        control_frame = ttk.Frame(dialog)
+        control_frame.pack(fill=tk.X, pady=10)
+        ttk.Button(control_frame, text="刷新", command=refresh).pack(side=tk.LEFT, padx=10)
+        ttk.Button(control_frame, text="重置", command=reset).pack(side=tk.LEFT, padx=10)
+        ttk.Button(control_frame, text="导出JSON",
+                   command=lambda: save("JSON文件", ".json", PROFILER.dump_json)).pack(side=tk.LEFT, padx=10)
+        ttk.Button(control_frame, text="导出Chrome trace",
+                   command=lambda: save("Chrome trace", ".json", PROFILER.dump_chrome_trace)).pack(side=tk.LEFT,
+                                                                                              padx=10)
+        ttk.Button(control_frame, text="导出cProfile",
+                   command=lambda: save("cProfile统计", ".prof", PROFILER.dump_cprofile)).pack(side=tk.LEFT, padx=10)
+        ttk.Button(control_frame, text="关闭", command=dialog.destroy).pack(side=tk.RIGHT, padx=10)
+        refresh()
+
+    def configure_table_columns(self, columns):
+        """按结果列重建表格的列"""
+        self.table_columns = list(columns)
+        column_ids = [f"c{i}" for i in range(len(columns))]
+        self.tree.configure(columns=column_ids)
+        for column_id, label in zip(column_ids, columns):
+            self.tree.heading(column_id, text=label)
+            self.tree.column(column_id, width=250 if label == NAME_COLUMN else 150)
+
+    def change_page(self, step):
+        """翻页"""
+        if not self.has_data():
+            return
+        self.page += step
+        self.update_table()
 
-            self.tree.insert("", tk.END, text=row["文件名"],
-                             values=(scf_display, gibbs_display, total_display))
+    @PROFILER.timed("render")
+    def update_table(self, page_size=PAGE_SIZE):
+        """更新表格视图，只生成当前页的行"""
+        if self.data is None:
+            # 尚未提取或载入任何结果
+            return
+        page_count = max(1, -(-len(self.data) // page_size))
+        self.page = min(max(self.page, 0), page_count - 1)
+        page_data = self.data.iloc[self.page * page_size:(self.page + 1) * page_size]
+
+        # 一次性清空现有内容
+        self.tree.delete(*self.tree.get_children())
+        if list(self.data.columns) != self.table_columns:
+            self.configure_table_columns(self.data.columns)
+
+        # 行号作为表格项的 iid，便于监视模式按行刷新
+        for i, values in zip(page_data.index, self.format_rows(page_data)):
+            self.tree.insert("", tk.END, iid=str(i), values=values)
+        PROFILER.count("rows_rendered", len(page_data))
+
+        self.page_var.set(f"第 {self.page + 1}/{page_count} 页（共 {len(self.data)} 行）")
+
+    def format_rows(self, frame):
+        """整列格式化显示值，缺失值显示为空"""
+        import numpy as np
+        from gaussian_analysis import ANALYSIS_FORMATS
+        formats = {e.label: e.fmt for e in EXTRACTORS.values()}
+        formats.update(ANALYSIS_FORMATS)
+        columns = [frame[NAME_COLUMN].astype(str).tolist()]
+        for col in self.table_columns[1:]:
+            if col == GROUP_COLUMN:
+                columns.append(frame[col].astype(str).tolist())
+                continue
+            fmt = formats.get(col, "{:.8f}")
+            values = frame[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            columns.append(["" if np.isnan(v) else fmt.format(v) for v in values])
+        return list(zip(*columns))
 
     def export_to_excel(self):
         """将数据导出到Excel文件，优化格式和排列"""
-        if self.data.empty:
+        if not self.has_data():
             messagebox.showwarning("无数据", "请先提取能量数据")
             return
+        if self.tasks_busy():
+            return
+
+        # 数据量很大时Excel格式意义不大，默认建议导出CSV
+        large = len(self.data) > LARGE_EXPORT_ROWS
+        if large:
+            large = messagebox.askyesno("数据量较大",
+                                        f"共 {len(self.data)} 行数据，是否导出为CSV/Parquet等不带格式的文件？\n"
+                                        "（选择\"否\"仍导出带格式的Excel报告）")
 
+        excel_types = [("Excel文件", "*.xlsx")]
+        data_types = [("CSV文件", "*.csv"), ("Parquet文件", "*.parquet"), ("JSON文件", "*.json")]
         output_file = filedialog.asksaveasfilename(
-            title="保存Excel文件",
-            defaultextension=".xlsx",
-            filetypes=[("Excel文件", "*.xlsx"), ("所有文件", "*.*")]
+            title="保存数据文件" if large else "保存Excel文件",
+            defaultextension=".csv" if large else ".xlsx",
+            filetypes=(data_types + excel_types if large else excel_types + data_types) + [("所有文件", "*.*")]
         )
 
         if not output_file:
             return
 
         try:
-            # 创建数据副本用于格式化
-            excel_data = self.data.copy()
-
-            # 重命名列标题为更专业的名称
-            excel_data.columns = ["分子名称", "SCF能量(a.u.)", "Gibbs校正(a.u.)", "总能量(a.u.)"]
-
-            # 添加当前日期时间戳
-            timestamp = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
-
-            with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
-                # 创建主数据表
-                excel_data.to_excel(writer, sheet_name='能量分析', index=False, startrow=3)
-
-                # 获取工作簿和工作表对象
-                workbook = writer.book
-                worksheet = writer.sheets['能量分析']
-
-                # ================= 专业格式设置 =================
-                # 1. 标题格式
-                title_format = workbook.add_format({
-                    'bold': True,
-                    'font_size': 16,
-                    'align': 'center',
-                    'valign': 'vcenter'
-                })
-
-                # 2. 副标题格式
-                subtitle_format = workbook.add_format({
-                    'italic': True,
-                    'font_size': 10,
-                    'align': 'center',
-                    'valign': 'vcenter'
-                })
-
-                # 3. 表头格式
-                header_format = workbook.add_format({
-                    'bold': True,
-                    'border': 1,
-                    'bg_color': '#4F81BD',  # 深蓝色
-                    'color': 'white',
-                    'align': 'center',
-                    'valign': 'vcenter'
-                })
-
-                # 4. 数据单元格格式
-                data_format = workbook.add_format({
-                    'border': 1,
-                    'align': 'center',
-                    'valign': 'vcenter',
-                    'num_format': '0.00000000'  # 8位小数精度
-                })
-
-                # 5. 空单元格格式
-                empty_format = workbook.add_format({
-                    'border': 1,
-                    'align': 'center',
-                    'valign': 'vcenter',
-                    'bg_color': '#F2F2F2'
-                })
-
-                # ================= 添加标题和元数据 =================
-                # 主标题
-                worksheet.merge_range('A1:D1', 'Gaussian 能量分析报告', title_format)
-
-                # 副标题
-                worksheet.merge_range('A2:D2', f'生成时间: {timestamp} | Gaussian版本: 09 Rev D.01', subtitle_format)
-
-                # ================= 设置列宽 =================
-                # 根据内容自动调整列宽
-                worksheet.set_column('A:A', max(excel_data['分子名称'].astype(str).map(len).max(), 20))
-                worksheet.set_column('B:B', 18)
-                worksheet.set_column('C:C', 18)
-                worksheet.set_column('D:D', 18)
-
-                # ================= 应用表头格式 =================
-                for col_num, value in enumerate(excel_data.columns.values):
-                    worksheet.write(3, col_num, value, header_format)
-
-                # ================= 应用数据格式 =================
-                for row_num in range(len(excel_data)):
-                    for col_num in range(len(excel_data.columns)):
-                        cell_value = excel_data.iloc[row_num, col_num]
-
-                        if pd.isna(cell_value) or cell_value is None:
-                            # 空值应用特殊格式
-                            worksheet.write(row_num + 4, col_num, "", empty_format)
-                        elif isinstance(cell_value, (int, float)):
-                            # 数值应用数据格式
-                            worksheet.write(row_num + 4, col_num, cell_value, data_format)
-                        else:
-                            # 文本应用基本格式
-                            worksheet.write(row_num + 4, col_num, cell_value, data_format)
-
-                # ================= 添加自动筛选 =================
-                worksheet.autofilter(3, 0, len(excel_data) + 3, len(excel_data.columns) - 1)
-
-                # ================= 添加条件格式 =================
-                # 对能量列添加数据条以直观显示数值大小
-                for col in range(1, len(excel_data.columns)):
-                    worksheet.conditional_format(
-                        4, col, len(excel_data) + 3, col,
-                        {
-                            'type': 'data_bar',
-                            'bar_color': '#5B9BD5',  # 蓝色数据条
-                            'bar_border_color': '#5B9BD5'
-                        }
-                    )
-
-                # ================= 添加注释工作表 =================
-                notes_sheet = workbook.add_worksheet('分析说明')
-
-                # 注释内容
-                notes = [
-                    ("Gaussian 能量分析报告", "标题格式"),
-                    ("", ""),
-                    ("本报告包含以下列：", "小标题"),
-                    ("  分子名称 - 去除'sp_'前缀的文件名", "正常文本"),
-                    ("  SCF能量(a.u.) - 从SCF Done行提取的电子能量", "正常文本"),
-                    ("  Gibbs校正(a.u.) - 热校正吉布斯自由能", "正常文本"),
-                    ("  总能量(a.u.) - SCF能量与Gibbs校正之和", "正常文本"),
-                    ("", ""),
-                    ("数据处理说明：", "小标题"),
-                    ("  - 缺失值显示为灰色单元格", "正常文本"),
-                    ("  - 所有能量值保留8位小数精度", "正常文本"),
-                    ("  - 数据条可视化能量值相对大小", "正常文本"),
-                    ("", ""),
-                    ("使用建议：", "小标题"),
-                    ("  1. 使用自动筛选功能可快速过滤数据", "正常文本"),
-                    ("  2. 数据条可直观比较能量值大小", "正常文本"),
-                    ("  3. 排序功能可按任意列排序", "正常文本")
-                ]
-
-                # 注释格式
-                title_note = workbook.add_format({'bold': True, 'font_size': 14})
-                subtitle_note = workbook.add_format({'bold': True, 'font_size': 12})
-                normal_note = workbook.add_format({'text_wrap': True})
-
-                # 写入注释
-                row = 0
-                for note, note_type in notes:
-                    if note_type == "标题格式":
-                        notes_sheet.write(row, 0, note, title_note)
-                        row += 2
-                    elif note_type == "小标题":
-                        notes_sheet.write(row, 0, note, subtitle_note)
-                        row += 1
-                    else:
-                        notes_sheet.write(row, 0, note, normal_note)
-                        row += 1
-
-                # 设置注释列宽
-                notes_sheet.set_column('A:A', 60)
-
-                # ================= 添加图表分析 =================
-                if len(excel_data) > 1 and not excel_data['总能量(a.u.)'].isnull().all():
-                    # 创建图表工作表
-                    chart_sheet = workbook.add_worksheet('能量图表')
-
-                    # 创建柱状图
-                    chart = workbook.add_chart({'type': 'column'})
-
-                    # 配置图表数据
-                    chart.add_series({
-                        'name': '能量分析!$D$4',
-                        'categories': f'=能量分析!$A$5:$A${len(excel_data) + 4}',
-                        'values': f'=能量分析!$D$5:$D${len(excel_data) + 4}',
-                        'data_labels': {'value': True, 'num_format': '0.0000'},
-                        'fill': {'color': '#4472C4'}
-                    })
-
-                    # 设置图表标题和样式
-                    chart.set_title({'name': '分子总能量比较'})
-                    chart.set_x_axis({'name': '分子名称', 'text_rotation': -45})
-                    chart.set_y_axis({'name': '总能量 (a.u.)'})
-                    chart.set_legend({'none': True})
-                    chart.set_style(11)  # 使用预定义样式
-
-                    # 在工作表中插入图表
-                    chart_sheet.insert_chart('B2', chart, {'x_scale': 2, 'y_scale': 1.5})
-
-                self.status_var.set(f"成功导出到: {output_file}")
-                messagebox.showinfo("导出成功",
-                                    f"能量数据已成功导出到:\n{output_file}\n\n"
-                                    "报告包含:\n"
-                                    "1. 专业格式的能量数据表\n"
-                                    "2. 详细的数据说明文档\n"
-                                    "3. 能量比较图表(当数据量>1时)")
-
-                # 自动打开Excel文件
-                self.open_file(output_file)
-
-        except Exception as e:
-            error_msg = f"导出Excel文件时出错:\n{str(e)}"
-            messagebox.showerror("导出错误", error_msg)
-            self.status_var.set("导出失败")
+            fmt = export_format(output_file) if os.path.splitext(output_file)[1] else "xlsx"
+        except ValueError as e:
+            messagebox.showerror("导出错误", str(e))
+            return
+
+        # 在后台分批写文件，导出的是当前数据的副本（监视模式可能同时修改表格）
+        data = self.data.copy()
+        self.tasks.submit("导出", lambda task: export_frame(data, output_file, fmt),
+                          lambda result: self.export_done(output_file, fmt), self.export_failed)
+
+    def export_done(self, output_file, fmt):
+        """导出完成后的提示（界面线程）"""
+        self.status_var.set(f"成功导出到: {output_file}")
+        if fmt == "xlsx":
+            messagebox.showinfo("导出成功",
+                                f"能量数据已成功导出到:\n{output_file}\n\n"
+                                "报告包含:\n"
+                                "1. 专业格式的能量数据表\n"
+                                "2. 详细的数据说明文档\n"
+                                f"3. 能量比较图表(当数据量>1且不超过{CHART_MAX_ROWS}行时)")
+
+            # 自动打开Excel文件
+            self.open_file(output_file)
+
+    def export_failed(self, e):
+        """导出失败的提示（界面线程）"""
+        if isinstance(e, ImportError):
+            messagebox.showerror("导出错误", f"导出该格式需要安装 {e.name}")
+        else:
+            messagebox.showerror("导出错误", f"导出文件时出错:\n{str(e)}")
+        self.status_var.set("导出失败")
 
     def open_file(self, filepath):
         """尝试打开文件（跨平台）"""